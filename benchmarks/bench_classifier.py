@@ -0,0 +1,204 @@
+"""
+Benchmark of the article classifier against the original keyword loops.
+
+Usage:
+    python benchmarks/bench_classifier.py [PAGES ...] [--repeat N] [--fuzz N]
+
+PAGES are saved article pages (.html files) or folders holding them. Entries of
+the scraper's page cache (.scholar_cache/*.gz) can be given directly, so the pages
+of any earlier run can be used as the corpus. Every page is classified by both
+implementations, any difference is reported, and the time per article is printed.
+"""
+import argparse
+import gzip
+import os
+import random
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scholar_scraper.keywords import (conference_keywords, ignored_keywords, citations_keywords,
+                                      preprint_keywords, journal_keywords, book_keywords,
+                                      book_chapter_keywords, patent_keywords)
+from scholar_scraper.classifier import classify_article_fields
+from scholar_scraper.parsing import field_strings
+
+
+def legacy_process_article_fields(fields, values, counters):
+    """The classifier as it was before scholar_scraper/classifier.py (kept for comparison)."""
+
+    for field, value in zip(fields, values):
+        article_field = field.string.lower().strip()
+
+        # Check for ignored fields
+        if any(ignored_keyword in article_field for ignored_keyword in ignored_keywords):
+            continue
+
+        # Handle conference-related keywords
+        elif any(keyword in article_field for keyword in conference_keywords) or (value and any(keyword in str(value) for keyword in conference_keywords)):
+            counters['Conference Papers'] += 1
+            continue
+
+        # Handle preprint-related keywords
+        elif value and any(keyword in str(value) for keyword in preprint_keywords):
+            counters['arXiv Preprint'] += 1
+            continue
+
+        # Handle journal-related keywords
+        elif any(keyword in article_field for keyword in journal_keywords) and 'preprint' not in str(value).lower():
+            counters['Peer Reviewed Articles'] += 1
+            continue
+
+        # Handle book-related keywords
+        elif any(keyword in article_field for keyword in book_keywords):
+            counters['Books'] += 1
+
+            # Check if the next field is 'book chapter' and has pages
+            next_field_index = fields.index(field) + 1
+            if next_field_index < len(fields):
+                next_article_field = fields[next_field_index].string.lower(
+                ).strip()
+                next_value = values[next_field_index]
+
+                # Check if the next field is a book chapter and only count it as a book chapter
+                if any(keyword in next_article_field for keyword in book_chapter_keywords) and str(next_value):
+                    counters['Book Chapters'] += 1
+                    counters['Books'] -= 1
+            continue
+
+        # Handle patent-related keywords
+        elif any(keyword in article_field for keyword in patent_keywords):
+            counters['Patent'] += 1
+            continue
+
+        # Handle cases that don't match any known keyword
+        if not (any(keyword in article_field for keyword in (citations_keywords | preprint_keywords | journal_keywords | conference_keywords | book_keywords | patent_keywords)) or
+                any(keyword in str(value) for keyword in (conference_keywords | preprint_keywords))):
+            return counters, 4
+
+    return counters, 1
+
+
+def new_counters():
+    return {
+        'Peer Reviewed Articles': 0,
+        'arXiv Preprint': 0,
+        'Books': 0,
+        'Book Chapters': 0,
+        'Conference Papers': 0,
+        'Patent': 0
+    }
+
+
+def read_page(path):
+    """Returns the HTML of a saved page or of a page cache entry."""
+
+    if path.endswith('.gz'):
+        with gzip.open(path, 'rb') as file:
+            file.readline()  # Skip the cache metadata line
+            return file.read().decode('utf-8', 'replace')
+    with open(path, 'r', encoding='utf-8', errors='replace') as file:
+        return file.read()
+
+
+def load_articles(paths):
+    """Returns the (fields, values) of every article page found in the given paths."""
+
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                         if name.endswith(('.html', '.gz')))
+        else:
+            files.append(path)
+
+    articles = []
+    for path in files:
+        doc = BeautifulSoup(read_page(path), 'html.parser')
+        fields = doc.find_all('div', class_='gsc_oci_field')
+        values = doc.find_all('div', class_='gsc_oci_value')
+        if fields:
+            articles.append((path, fields, values))
+    return articles
+
+
+def fuzz_articles(count, seed=0):
+    """Builds random articles from keyword fragments, to compare the two classifiers on odd input."""
+
+    fragments = sorted(conference_keywords | ignored_keywords | citations_keywords |
+                       preprint_keywords | journal_keywords | book_keywords |
+                       book_chapter_keywords | patent_keywords)
+    fragments += ['source', 'inventors', 'arXiv', 'ARXIV', 'x', ' ', 'Journal of',
+                  'bookpage', 'chapter', 'pre', 'print']
+    generator = random.Random(seed)
+
+    def text():
+        words = generator.sample(fragments, generator.randint(1, 3))
+        return ''.join(generator.choice((word, word.upper(), word.title())) for word in words)
+
+    articles = []
+    for number in range(count):
+        rows = ''.join(
+            f'<div class="gsc_oci_field">{text()}</div><div class="gsc_oci_value">{text()}</div>'
+            for _ in range(generator.randint(1, 8)))
+        doc = BeautifulSoup(f'<div id="gsc_oci_table">{rows}</div>', 'html.parser')
+        articles.append((f'fuzz {number}', doc.find_all('div', class_='gsc_oci_field'),
+                         doc.find_all('div', class_='gsc_oci_value')))
+    return articles
+
+
+def time_classifier(classify, articles, repeat):
+    """Returns the best time per article in microseconds over the given number of repeats."""
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _, fields, values in articles:
+            classify(fields, values, new_counters())
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(articles) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pages', nargs='*', default=['.scholar_cache'],
+                        help="saved article pages or folders of them (default: .scholar_cache)")
+    parser.add_argument('--repeat', type=int, default=5,
+                        help="timing repeats, the best one is reported")
+    parser.add_argument('--fuzz', type=int, default=0,
+                        help="also compare on this many randomly generated articles")
+    args = parser.parse_args()
+
+    articles = load_articles([path for path in args.pages if os.path.exists(path)])
+    articles += fuzz_articles(args.fuzz)
+    if not articles:
+        exit("No article pages found")
+
+    # The scraper classifies the fields as strings, once the page has been read
+    article_strings = [(name, *field_strings(fields, values)) for name, fields, values in articles]
+
+    differences = 0
+    for (name, fields, values), (_, field_names, field_values) in zip(articles, article_strings):
+        expected = legacy_process_article_fields(fields, values, new_counters())
+        actual = classify_article_fields(field_names, field_values, new_counters())
+        if expected != actual:
+            differences += 1
+            print(f"Different result for {name}:\n  legacy: {expected}\n  new:    {actual}")
+
+    legacy_time = time_classifier(legacy_process_article_fields, articles, args.repeat)
+    new_time = time_classifier(classify_article_fields, article_strings, args.repeat)
+
+    print(f"Articles compared: {len(articles)}, differences: {differences}")
+    print(f"Legacy classifier: {legacy_time:.1f} us per article")
+    print(f"Compiled classifier: {new_time:.1f} us per article ({legacy_time / new_time:.1f}x faster)")
+    if differences:
+        exit(1)
+
+
+if __name__ == '__main__':
+    main()
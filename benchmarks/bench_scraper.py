@@ -0,0 +1,284 @@
+"""
+End-to-end benchmark of the scraper against a local stand-in for Google Scholar.
+
+Usage:
+    python benchmarks/bench_scraper.py [--profiles N] [--articles N] [--corpus DIR]
+                                       [--latency S] [--jitter S] [--throttle RPS]
+                                       [--inject-429 FRACTION] [--proxies N]
+                                       [--citation-export FORMAT]
+                                       [--json FILE]
+                                       [--baseline FILE] [--tolerance FRACTION]
+
+The corpus is generated (the same pages for the same arguments) unless --corpus names
+a page cache folder of an earlier run (.scholar_cache). The whole scraper runs against
+the stand-in server, which can add latency, throttle and inject 429 answers, and the
+report gives:
+
+    profiles per minute   end to end, including pagination, retries and writing
+    parse time            per profile page and per article page
+    classification time   per article
+    peak memory           of the process (and of the scrape alone with --trace-memory)
+
+With --json the report is saved, together with the scraper's timing of every stage
+(see scholar_scraper/instrumentation.py); with --baseline it is compared to a saved report and
+the benchmark fails if a measure got worse by more than --tolerance.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from scholar_scraper import Scraper, ScraperConfig
+from scholar_scraper.classifier import classify_article_fields
+from scholar_scraper.fetcher import CountingHTTPAdapter
+from scholar_scraper.inputs import parse_years
+from scholar_scraper.parsing import (profile_page_ids, article_page_ids, parse_page,
+                                     find_article_fields)
+from scholar_scraper.articles import new_counters
+
+from corpus import SyntheticCorpus, RecordedCorpus
+from scholar_server import StandInScholar
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Measures compared to a baseline, and whether a higher value is better
+compared_measures = {
+    'profiles_per_minute': True,
+    'parse_profile_page_ms': False,
+    'parse_article_page_ms': False,
+    'classify_article_us': False,
+    'peak_memory_mb': False,
+}
+
+
+class StandInAdapter(CountingHTTPAdapter):
+    """Sends the requests for scholar.google.* to the stand-in server instead."""
+
+    def __init__(self, fetcher, server_url, **kwargs):
+        self.server_url = server_url
+        super().__init__(fetcher, **kwargs)
+
+    def send(self, request, **kwargs):
+        original_url = request.url
+        parsed = urlparse(original_url)
+        request.url = f'{self.server_url}{parsed.path}?{parsed.query}'
+        response = super().send(request, **kwargs)
+        response.url = original_url
+        return response
+
+
+def best_time(function, items, repeat):
+    """Returns the best time per item in seconds over the given number of repeats."""
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            function(item)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(items)
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_scraper(corpus, server, config, trace_memory):
+    """Scrapes every profile of the corpus through the stand-in server."""
+
+    with tempfile.TemporaryDirectory() as directory:
+        urls_file = os.path.join(directory, 'urls.txt')
+        with open(urls_file, 'w') as file:
+            file.write('\n'.join(corpus.profile_urls))
+
+        config.checkpoint_file = os.path.join(directory, 'checkpoint.jsonl')
+        config.inspection_report = os.path.join(directory, 'inspection_report.jsonl')
+        scraper = Scraper(config)
+        pool_size = config.max_concurrent_requests + 1
+        scraper.fetcher.session.mount('https://scholar.google', StandInAdapter(
+            scraper.fetcher, server.url, pool_connections=pool_size, pool_maxsize=pool_size))
+
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            scraper.run(urls_file, os.path.join(directory, 'output.csv'))
+        elapsed = time.perf_counter() - start
+        traced_peak = None
+        if trace_memory:
+            traced_peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            tracemalloc.stop()
+
+        return elapsed, scraper.fetcher.report(), traced_peak, scraper.instrumentation.report()['stages']
+
+
+def time_parsing(corpus, backend, repeat):
+    """Returns the parse time per profile page and per article page, in milliseconds."""
+
+    pages = {'profile': [], 'article': []}
+    for kind, html in corpus.pages():
+        pages[kind].append(html)
+
+    times = {}
+    for kind, page_ids in (('profile', profile_page_ids), ('article', article_page_ids)):
+        if pages[kind]:
+            times[kind] = best_time(lambda html: parse_page(html, page_ids, backend),
+                                    pages[kind], repeat) * 1000
+    return times, pages['article']
+
+
+def time_classification(article_pages, backend, repeat):
+    """Returns the classification time per article, in microseconds."""
+
+    articles = [find_article_fields(parse_page(html, article_page_ids, backend))
+                for html in article_pages]
+    articles = [(fields, values) for fields, values, _ in articles if fields]
+    if not articles:
+        return None
+    return best_time(lambda article: classify_article_fields(article[0], article[1], new_counters()),
+                     articles, repeat) * 1e6
+
+
+def compare(report, baseline, tolerance):
+    """Returns a message for every measure that got worse than the baseline by more than tolerance."""
+
+    regressions = []
+    for measure, higher_is_better in compared_measures.items():
+        old, new = baseline.get(measure), report.get(measure)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        if (-change if higher_is_better else change) > tolerance:
+            regressions.append(f"{measure}: {old:.2f} -> {new:.2f} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profiles', type=int, default=20, help="generated profiles")
+    parser.add_argument('--articles', type=int, default=120, help="generated articles per profile")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the corpus and of the server")
+    parser.add_argument('--corpus', help="page cache folder to serve instead of generated pages")
+    parser.add_argument('--years', default='2022-2024', help="year periods to scrape")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds before every answer")
+    parser.add_argument('--jitter', type=float, default=0.0, help="random extra latency, in seconds")
+    parser.add_argument('--throttle', type=float,
+                        help="requests per second above which the server answers 429")
+    parser.add_argument('--inject-429', type=float, default=0.0,
+                        help="fraction of the requests answered 429 at random")
+    parser.add_argument('--rate', type=float, default=200,
+                        help="the scraper's requests per second (its rate budget)")
+    parser.add_argument('--concurrency', type=int, default=4, help="articles fetched at once")
+    parser.add_argument('--prefetch', type=int, default=2,
+                        help="upcoming profiles whose first page is fetched ahead")
+    parser.add_argument('--citation-export', choices=('ris', 'bibtex'),
+                        help="classify the articles from the citation exports the stand-in serves")
+    parser.add_argument('--parser', default='auto', help="HTML parser backend")
+    parser.add_argument('--repeat', type=int, default=3, help="timing repeats, the best one is reported")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="also measure the peak Python memory of the scrape (slows it down)")
+    parser.add_argument('--proxies', type=int, default=0,
+                        help="send the requests through this many stand-in proxies, each "
+                             "throttled and injecting 429s on its own (see --throttle)")
+    parser.add_argument('--json', help="save the report to this file")
+    parser.add_argument('--baseline', help="saved report to compare to")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed slowdown against the baseline (default: 0.25)")
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus = RecordedCorpus(args.corpus)
+    else:
+        corpus = SyntheticCorpus(args.profiles, args.articles, args.seed)
+    if not corpus.profile_urls:
+        exit("The corpus has no profiles")
+
+    # A stand-in answers requests sent to it as a proxy too, so the proxies are stand-ins
+    # and the requests never reach the server itself
+    server = StandInScholar(corpus, args.latency, args.jitter, args.throttle,
+                            args.inject_429, seed=args.seed).start()
+    proxies = [StandInScholar(corpus, args.latency, args.jitter, args.throttle,
+                              args.inject_429, seed=args.seed + number + 1).start()
+               for number in range(args.proxies)]
+    config = ScraperConfig(
+        input_years=parse_years(args.years),
+        requests_per_second=args.rate,
+        request_burst=max(2, args.concurrency),
+        max_concurrent_requests=args.concurrency,
+        prefetch_profiles=args.prefetch,
+        retry_backoff=0.2,
+        max_retry_delay=2,
+        html_parser_backend=args.parser,
+        citation_export=args.citation_export,
+        egress_endpoints=[proxy.url for proxy in proxies] or None,
+        egress_quarantine=2,
+        use_cache=False,
+        summary_file=None,
+        state_file=None)
+    try:
+        elapsed, stats, traced_peak, stages = run_scraper(corpus, server, config, args.trace_memory)
+    finally:
+        for stand_in in [server] + proxies:
+            stand_in.stop()
+
+    parse_times, article_pages = time_parsing(corpus, args.parser, args.repeat)
+    classify_time = time_classification(article_pages, args.parser, args.repeat)
+
+    profiles = len(corpus.profile_urls)
+    report = {
+        'profiles': profiles,
+        'wall_seconds': round(elapsed, 3),
+        'profiles_per_minute': round(profiles / elapsed * 60, 2),
+        'requests': stats['requests'],
+        'retries': stats['retries'],
+        'blocks': stats['blocks'],
+        'server_429': sum(stand_in.stats['throttled'] + stand_in.stats['injected_429']
+                          for stand_in in [server] + proxies),
+        'bytes_transferred': stats['bytes_transferred'],
+        'parse_profile_page_ms': round(parse_times.get('profile', 0), 3),
+        'parse_article_page_ms': round(parse_times.get('article', 0), 3),
+        'classify_article_us': round(classify_time, 2) if classify_time else None,
+        'peak_memory_mb': round(peak_rss_mb(), 1) if resource else None,
+        'traced_peak_memory_mb': round(traced_peak, 1) if traced_peak is not None else None,
+        'stages': stages,
+        'settings': {key: value for key, value in vars(args).items()
+                     if key not in ('json', 'baseline')},
+    }
+
+    for key, value in report.items():
+        if key not in ('settings', 'stages') and value is not None:
+            print(f"{key.replace('_', ' ').capitalize()}: {value}")
+
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(report, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            exit(1)
+        print("No regression against the baseline")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,258 @@
+"""
+Pages served by the stand-in Scholar server of the benchmarks.
+
+A corpus is either generated (the same pages for the same arguments, in the markup the
+scraper reads from Google Scholar) or recorded: the scraper's page cache
+(.scholar_cache) of an earlier run, served back exactly as it was fetched.
+"""
+import gzip
+import json
+import os
+import random
+from urllib.parse import urlparse, parse_qs
+
+# Field sets of the generated article pages, covering every branch of the classifier
+article_kinds = [
+    [('Journal', 'Nature'), ('Volume', '12'), ('Pages', '1-10')],
+    [('Journal', 'Journal of Applied Things'), ('Issue', '3')],
+    [('Conference', 'Proceedings of the International Conference on Machine Learning')],
+    [('Journal', 'arXiv preprint arXiv:2101.00001')],
+    [('Book', 'A Big Book'), ('Pages', '1-300'), ('Publisher', 'Springer')],
+    [('Book', 'A Big Book'), ('Book chapter', '3'), ('Pages', '40-60')],
+    [('Patent office', 'US'), ('Patent number', '1234567'), ('Application number', '12/345')],
+    [('Source', 'Workshop on Small Things')],
+    [('Publisher', 'IEEE')],
+    [('Institution', 'University of Guelph')],
+]
+
+
+def profile_url(user):
+    return f'https://scholar.google.ca/citations?user={user}&hl=en'
+
+
+def article_url(user, article_id):
+    return (f'https://scholar.google.ca/citations?view_op=view_citation&hl=en'
+            f'&user={user}&citation_for_view={user}:{article_id}')
+
+
+class SyntheticCorpus:
+    """
+    Generated profiles, each with its works list and article pages.
+
+    Every profile lists its articles newest first, starting in December of newest_year,
+    with a few months between articles, so long profiles span many year periods and
+    need several pages of the works list.
+
+    Args:
+        profiles (int): Number of profiles.
+        articles (int): Number of articles per profile.
+        seed (int): Seed of the generated content.
+        newest_year (int): Year of the newest article of every profile.
+    """
+
+    def __init__(self, profiles=20, articles=120, seed=0, newest_year=2025):
+        self.newest_year = newest_year
+        self.users = [f'BENCH{number:04d}' for number in range(profiles)]
+        self.articles = {user: self.make_articles(user, articles, seed + number)
+                         for number, user in enumerate(self.users)}
+        self.profile_urls = [profile_url(user) for user in self.users]
+
+    def make_articles(self, user, count, seed):
+        generator = random.Random(seed)
+        year, month = self.newest_year, 12
+        articles = []
+        for number in range(count):
+            if number % 23 == 7:
+                date = str(year)  # No month, which the scraper reports for manual inspection
+            elif number % 3:
+                date = f'{year}/{month}'
+            else:
+                date = f'{year}/{month}/{generator.randint(1, 28)}'
+            articles.append({
+                'id': f'A{number:05d}',
+                'title': f'Study {number} of {user}',
+                'venue': f'Venue {generator.randint(1, 40)}',
+                'year': year,
+                'date': date,
+                'fields': generator.choice(article_kinds),
+                'cluster': str(generator.randrange(10 ** 15, 10 ** 16))
+            })
+            month -= generator.randint(0, 2)
+            if month < 1:
+                month += 12
+                year -= 1
+        return articles
+
+    def page(self, path):
+        """Returns the HTML of the page at path (with its query), or None if there is none."""
+
+        query = parse_qs(urlparse(path).query)
+        user = query.get('user', [''])[0]
+        if user not in self.articles:
+            return None
+
+        if query.get('view_op') == ['export_citations']:
+            ids = {article_id.partition(':')[2] for article_id in query.get('s', [''])[0].split(',')}
+            articles = [article for article in self.articles[user] if article['id'] in ids]
+            return self.export(articles, query.get('cit_fmt', ['0'])[0])
+
+        if 'citation_for_view' in query:
+            article_id = query['citation_for_view'][0].partition(':')[2]
+            for article in self.articles[user]:
+                if article['id'] == article_id:
+                    return self.article_page(article)
+            return None
+
+        start = int(query.get('cstart', ['0'])[0])
+        size = int(query.get('pagesize', ['20'])[0])
+        return self.profile_page(user, start, size)
+
+    def profile_page(self, user, start, size):
+        articles = self.articles[user]
+        rows = ''.join(
+            f'<tr class="gsc_a_tr"><td class="gsc_a_t">'
+            f'<a href="/citations?view_op=view_citation&amp;hl=en&amp;user={user}&amp;citation_for_view={user}:{article["id"]}" class="gsc_a_at">{article["title"]}</a>'
+            f'<div class="gs_gray">A. Author, B. Author</div>'
+            f'<div class="gs_gray">{article["venue"]}<span class="gs_oph">, {article["year"]}</span></div></td>'
+            f'<td class="gsc_a_c"><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;cites={article["cluster"]}" class="gsc_a_ac gs_ibl">3</a></td>'
+            f'<td class="gsc_a_y"><span class="gsc_a_h gsc_a_hc gs_ibl">{article["year"]}</span></td></tr>'
+            for article in articles[start:start + size])
+        disabled = ' disabled=""' if start + size >= len(articles) else ''
+        years = list(range(self.newest_year - 9, self.newest_year + 1))
+        histogram = (
+            ''.join(f'<span class="gsc_g_t" style="right:{index * 32}px">{year}</span>'
+                    for index, year in enumerate(reversed(years)))
+            + ''.join(f'<a href="javascript:void(0)" class="gsc_g_a" style="right:{index * 32}px">'
+                      f'<span class="gsc_g_al">{(year % 100) * 7}</span></a>'
+                      for index, year in enumerate(reversed(years))))
+        return (
+            f'<html><head><title>{user} - Google Scholar</title></head><body>'
+            f'<div id="gsc_prf_w"><div id="gsc_prf_in">Researcher {user}</div></div>'
+            f'<div id="gsc_rsb_cit" class="gsc_rsb_s gsc_prf_pnl"><table id="gsc_rsb_st">'
+            f'<thead><tr><th class="gsc_rsb_sth"></th><th class="gsc_rsb_sth">All</th>'
+            f'<th class="gsc_rsb_sth">Since {self.newest_year - 4}</th></tr></thead><tbody>'
+            f'<tr><td class="gsc_rsb_sc1"><a href="javascript:void(0)" class="gsc_rsb_f gs_ibl">Citations</a></td>'
+            f'<td class="gsc_rsb_std">{len(articles) * 11}</td><td class="gsc_rsb_std">{len(articles) * 4}</td></tr>'
+            f'<tr><td class="gsc_rsb_sc1"><a href="javascript:void(0)" class="gsc_rsb_f gs_ibl">h-index</a></td>'
+            f'<td class="gsc_rsb_std">{len(articles) // 6}</td><td class="gsc_rsb_std">{len(articles) // 10}</td></tr>'
+            f'<tr><td class="gsc_rsb_sc1"><a href="javascript:void(0)" class="gsc_rsb_f gs_ibl">i10-index</a></td>'
+            f'<td class="gsc_rsb_std">{len(articles) // 3}</td><td class="gsc_rsb_std">{len(articles) // 5}</td></tr>'
+            f'</tbody></table><div class="gsc_md_hist_w"><div class="gsc_md_hist_b">{histogram}</div></div></div>'
+            f'<table id="gsc_a_t"><tbody id="gsc_a_b">{rows}</tbody></table>'
+            f'<button type="button" id="gsc_bpf_more" class="gs_btnPD"{disabled}>'
+            f'<span class="gs_wr"><span class="gs_lbl">Show more</span></span></button>'
+            f'</body></html>')
+
+    def article_page(self, article):
+        fields = ([('Authors', 'A. Author, B. Author'), ('Publication date', article['date'])]
+                  + article['fields']
+                  + [('Description', 'An abstract about the things that were studied.'),
+                     ('Total citations', f'<a href="/scholar?cites={article["cluster"]}">Cited by 3</a>'),
+                     ('Scholar articles', article['title'])])
+        table = ''.join(f'<div class="gs_scl"><div class="gsc_oci_field">{field}</div>'
+                        f'<div class="gsc_oci_value">{value}</div></div>'
+                        for field, value in fields)
+        return (f'<html><head><title>{article["title"]}</title></head><body>'
+                f'<div id="gsc_oci_title">{article["title"]}</div>'
+                f'<div id="gsc_oci_table">{table}</div></body></html>')
+
+    def export(self, articles, export_format):
+        """Returns the citation export of some articles, as BibTeX (cit_fmt 0) or RIS (cit_fmt 2)."""
+
+        entries = []
+        for article in articles:
+            fields = dict(article['fields'])
+            if 'Journal' in fields:
+                entry_type = 'article'
+            elif 'Conference' in fields:
+                entry_type, fields['Book'] = 'inproceedings', fields.pop('Conference')
+            elif 'Book' in fields:
+                entry_type = 'incollection'
+            elif 'Institution' in fields:
+                entry_type = 'techreport'
+            else:
+                entry_type = 'misc'  # Patents and bare sources, which the scraper fetches instead
+            year, _, rest = article['date'].partition('/')
+            entries.append((entry_type, article, fields, year, rest.partition('/')[0]))
+
+        if export_format == '2':
+            ris_types = {'article': 'JOUR', 'inproceedings': 'CONF', 'incollection': 'CHAP',
+                         'techreport': 'RPRT', 'misc': 'GEN'}
+            ris_tags = {'Journal': 'JO', 'Book': 'T2', 'Volume': 'VL', 'Issue': 'IS',
+                        'Publisher': 'PB', 'Institution': 'PB', 'Source': 'T2',
+                        'Patent office': 'CY', 'Patent number': 'M1', 'Application number': 'M3'}
+            lines = []
+            for entry_type, article, fields, year, month in entries:
+                lines += [f'TY  - {ris_types[entry_type]}', f'TI  - {article["title"]}',
+                          'AU  - Author, A.', 'AU  - Author, B.',
+                          f'DA  - {year}/{month.zfill(2) if month else ""}', f'PY  - {year}']
+                for field, value in fields.items():
+                    if field == 'Pages':
+                        start, _, end = value.partition('-')
+                        lines += [f'SP  - {start}'] + ([f'EP  - {end}'] if end else [])
+                    elif field == 'Book chapter':
+                        lines.append(f'SE  - {value}')
+                    else:
+                        lines.append(f'{ris_tags[field]}  - {value}')
+                lines += ['ER  - ', '']
+            return '\n'.join(lines)
+
+        bibtex_fields = {'Journal': 'journal', 'Book': 'booktitle', 'Volume': 'volume',
+                         'Issue': 'number', 'Pages': 'pages', 'Publisher': 'publisher',
+                         'Institution': 'institution', 'Book chapter': 'chapter', 'Source': 'note',
+                         'Patent office': 'organization', 'Patent number': 'number',
+                         'Application number': 'note'}
+        records = []
+        for entry_type, article, fields, year, month in entries:
+            lines = [f'@{entry_type}{{{article["id"].lower()}{year},',
+                     f'  title={{{article["title"]}}},', '  author={Author, A. and Author, B.},',
+                     f'  year={{{year}}},']
+            if month:
+                lines.append(f'  month={{{month}}},')
+            lines += [f'  {bibtex_fields[field]}={{{value}}},' for field, value in fields.items()]
+            records.append('\n'.join(lines) + '\n}\n')
+        return '\n'.join(records)
+
+    def pages(self):
+        """Yields ('profile' or 'article', HTML) for every first profile page and article page."""
+
+        for user in self.users:
+            yield 'profile', self.profile_page(user, 0, 100)
+            for article in self.articles[user]:
+                yield 'article', self.article_page(article)
+
+
+class RecordedCorpus:
+    """
+    The pages of a scraper page cache, served at the URLs they were fetched from.
+
+    Args:
+        directory (str): The cache folder (e.g. .scholar_cache) holding the recorded pages.
+    """
+
+    def __init__(self, directory):
+        self.bodies = {}
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith('.gz'):
+                continue
+            with gzip.open(os.path.join(directory, name), 'rb') as file:
+                meta = json.loads(file.readline())
+                body = file.read().decode(meta.get('encoding') or 'utf-8', 'replace')
+            self.bodies[self.key(meta['url'])] = body
+
+        # Profiles whose first works page was recorded
+        self.profile_urls = sorted({
+            profile_url(parse_qs(urlparse(url).query)['user'][0])
+            for url in self.bodies
+            if 'view_op=list_works' in url and 'cstart' not in url and 'user=' in url})
+
+    def key(self, url):
+        parsed = urlparse(url)
+        return parsed.path + '?' + '&'.join(sorted(parsed.query.split('&')))
+
+    def page(self, path):
+        return self.bodies.get(self.key(path))
+
+    def pages(self):
+        for key, body in self.bodies.items():
+            yield 'article' if 'citation_for_view' in key else 'profile', body
@@ -0,0 +1,120 @@
+"""
+Local stand-in for Google Scholar that serves a benchmark corpus.
+
+The server can answer slowly (latency and jitter), throttle like Scholar does
+(answering 429 once more than throttle requests per second arrive) and inject 429
+answers at random, so the scraper's concurrency, rate budget and retries can be
+measured without sending a single request to Google.
+"""
+import gzip
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StandInScholar:
+    """
+    Serves a corpus over HTTP on 127.0.0.1 from a background thread.
+
+    Args:
+        corpus: The pages to serve (see corpus.py).
+        latency (float): Seconds before every answer.
+        jitter (float): Up to this many seconds added at random to the latency.
+        throttle (float): Requests per second above which the server answers 429 (None for no limit).
+        inject_429 (float): Fraction of the requests answered 429 at random.
+        retry_after (int): Seconds sent in the Retry-After header of a 429 answer.
+        seed (int): Seed of the random jitter and 429 injection.
+    """
+
+    def __init__(self, corpus, latency=0.0, jitter=0.0, throttle=None, inject_429=0.0,
+                 retry_after=1, seed=0):
+        self.corpus = corpus
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle = throttle
+        self.inject_429 = inject_429
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'throttled': 0, 'injected_429': 0, 'not_found': 0,
+                      'bytes_sent': 0}
+        self.tokens = throttle or 0
+        self.last_refill = time.monotonic()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                status, body = server.answer(self.path)
+                data = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                if status == 429:
+                    self.send_header('Retry-After', str(server.retry_after))
+                if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    data = gzip.compress(data, compresslevel=5)
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+                server.record('bytes_sent', len(data))
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def record(self, name, amount=1):
+        with self.lock:
+            self.stats[name] += amount
+
+    def throttled(self):
+        """Takes a token of the server's rate limit, returning True if there was none left."""
+
+        if not self.throttle:
+            return False
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.throttle, self.tokens + (now - self.last_refill) * self.throttle)
+            self.last_refill = now
+            if self.tokens < 1:
+                return True
+            self.tokens -= 1
+            return False
+
+    def answer(self, path):
+        """Returns the (status, HTML) of a request, after the configured latency."""
+
+        self.record('requests')
+        with self.lock:
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            inject = self.random.random() < self.inject_429
+        if delay:
+            time.sleep(delay)
+
+        if self.throttled():
+            self.record('throttled')
+            return 429, '<html><body>Too Many Requests</body></html>'
+        if inject:
+            self.record('injected_429')
+            return 429, '<html><body>Too Many Requests</body></html>'
+
+        body = self.corpus.page(path)
+        if body is None:
+            self.record('not_found')
+            return 404, '<html><body>Not Found</body></html>'
+        return 200, body
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,22 @@
+"""
+Google Scholar bibliometrics scraper.
+
+Importing the package is cheap: requests and BeautifulSoup are only loaded when a
+Scraper is first used. Typical use:
+
+    from scholar_scraper import Scraper, ScraperConfig
+
+    scraper = Scraper(ScraperConfig(input_year=2023))
+    scraper.run('urls.txt', 'output.csv')
+"""
+from .config import ScraperConfig
+
+__all__ = ['Scraper', 'ScraperConfig']
+
+
+def __getattr__(name):
+    # Load the scraper (and with it requests and BeautifulSoup) on first use only
+    if name == 'Scraper':
+        from .scraper import Scraper
+        return Scraper
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
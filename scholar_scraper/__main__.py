@@ -0,0 +1,152 @@
+import argparse
+import os
+import sys
+
+from . import diagnostics
+from .checkpoint import CheckpointError
+from .config import ScraperConfig
+from .egress import load_endpoints
+from .inputs import check_input_file, determine_years, parse_years
+from .instrumentation import Profiler
+from .sharding import merge_shards, run_shard, run_shards
+from .sinks import sink_types
+
+
+def main(argv=None):
+    """Command line entry point: python -m scholar_scraper"""
+
+    sys.stdout.reconfigure(encoding='utf-8')
+
+    parser = argparse.ArgumentParser(
+        prog='scholar_scraper',
+        description="Scrape the Google Scholar profiles listed in urls.txt")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue an interrupted run from its checkpoint journal")
+    parser.add_argument('--urls', default='urls.txt',
+                        help="file listing one profile URL per line (default: urls.txt)")
+    parser.add_argument('--year-file', default='year.txt',
+                        help="file holding the year to scrape (default: year.txt)")
+    parser.add_argument('--years',
+                        help="year periods to scrape instead of those in the year file, "
+                             "e.g. 2023, 2019-2023 or 2019,2021")
+    parser.add_argument('--output', action='append',
+                        help="file to write the results to, in the format of its extension: "
+                             ".csv, .jsonl, .sqlite/.db or .parquet (default: output.csv); "
+                             "repeat to write several formats")
+    parser.add_argument('--delta', action='store_true',
+                        help="only fetch the articles that are new since the last scrape of each "
+                             "profile, reusing what the last scrape found for the others")
+    parser.add_argument('--citation-export', choices=('ris', 'bibtex'),
+                        help="classify the articles from each profile's citation export in this "
+                             "format, only fetching the article pages the export does not settle")
+    parser.add_argument('--egress',
+                        help="file listing the proxies to spread the requests over: one proxy URL "
+                             "per line, or a .json list of proxies and header sets (see "
+                             "scholar_scraper/egress.py)")
+    parser.add_argument('--test-mode', action='store_true',
+                        help="print the checkpoint messages")
+    parser.add_argument('--offline', action='store_true',
+                        help="only use cached pages (no requests to Google Scholar)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="do not read or write the page cache")
+    parser.add_argument('--shards', type=int,
+                        help="split the profiles into this many shards, scraped by separate "
+                             "processes, then merge them into the outputs")
+    parser.add_argument('--workers', type=int,
+                        help="number of processes scraping the shards (default: one per shard)")
+    parser.add_argument('--shard', type=int,
+                        help="only scrape this shard (0 to --shards - 1), e.g. to spread the "
+                             "shards over several computers sharing this folder")
+    parser.add_argument('--merge', action='store_true',
+                        help="only merge the finished shards into the outputs")
+    parser.add_argument('--inspection-report', default='inspection_report.jsonl',
+                        help="file to record the profiles and articles needing manual inspection "
+                             "in: JSON lines, or an SQLite database for .sqlite/.db (default: "
+                             "inspection_report.jsonl, one per shard with --shards)")
+    parser.add_argument('--metrics',
+                        help="file to write a JSON report of the time, bytes, waits and retries "
+                             "of every stage to (one per shard with --shards)")
+    parser.add_argument('--profile',
+                        help="file to save a profile of this process to")
+    parser.add_argument('--profiler', choices=('cprofile', 'pyinstrument'), default='cprofile',
+                        help="profiler used by --profile: cprofile (pstats file, every thread) "
+                             "or pyinstrument (HTML report, main thread; needs pyinstrument)")
+    args = parser.parse_args(argv)
+
+    if (args.shard is not None or args.merge or args.workers) and not args.shards:
+        parser.error("--shard, --merge and --workers need --shards")
+    if args.shards is not None and args.shards < 1:
+        parser.error("argument --shards: must be at least 1")
+    if args.shard is not None and not 0 <= args.shard < args.shards:
+        parser.error(f"argument --shard: must be from 0 to {args.shards - 1}")
+    diagnostics.set_test_mode(args.test_mode)
+
+    outputs = args.output or ['output.csv']
+    for output in outputs:
+        extension = os.path.splitext(output)[1].lower()
+        if extension not in sink_types:
+            parser.error(f"argument --output: {output} is not one of {', '.join(sink_types)}")
+        try:
+            sink_types[extension].check_dependencies()
+        except ImportError as e:
+            parser.error(f"argument --output: {e}")
+
+    check_input_file(args.urls)
+
+    egress_endpoints = None
+    if args.egress:
+        try:
+            egress_endpoints = load_endpoints(args.egress)
+        except (OSError, ValueError) as e:
+            parser.error(f"argument --egress: {e}")
+
+    if args.years:
+        try:
+            input_years = parse_years(args.years)
+        except ValueError as e:
+            parser.error(f"argument --years: {e}")
+    else:
+        check_input_file(args.year_file)
+        input_years = determine_years(args.year_file)
+        if input_years is None:
+            exit("Program will now exit")
+
+    config = ScraperConfig(input_years=input_years,
+                           test_mode=args.test_mode,
+                           offline_replay=args.offline,
+                           use_cache=not args.no_cache,
+                           delta=args.delta,
+                           citation_export=args.citation_export,
+                           egress_endpoints=egress_endpoints,
+                           inspection_report=args.inspection_report,
+                           metrics_file=args.metrics)
+
+    profiler = None
+    if args.profile:
+        try:
+            profiler = Profiler(args.profile, args.profiler)
+        except ImportError as e:
+            parser.error(f"argument --profiler: {e}")
+        profiler.start()
+
+    try:
+        if args.merge:
+            merge_shards(config, args.urls, outputs, args.shards)
+        elif args.shard is not None:
+            run_shard(config, args.urls, outputs, args.shard, args.shards, args.resume)
+        elif args.shards:
+            run_shards(config, args.urls, outputs, args.shards, args.workers, args.resume)
+        else:
+            # Imported here so that --help does not load requests and BeautifulSoup
+            from .scraper import Scraper
+
+            Scraper(config).run(args.urls, outputs, args.resume)
+    except CheckpointError:
+        exit("Program will now exit")
+    finally:
+        if profiler:
+            profiler.stop()
+
+
+if __name__ == '__main__':
+    main()
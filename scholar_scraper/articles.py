@@ -0,0 +1,210 @@
+import re
+
+from .classifier import classify_article_fields
+from .diagnostics import checkpoint
+
+# Words an uncited article's title needs before articles on two profiles are taken for one paper
+minimum_title_words = 4
+
+
+def new_counters():
+    """Returns a fresh set of article type counters."""
+
+    return {
+        'Peer Reviewed Articles': 0,
+        'arXiv Preprint': 0,
+        'Books': 0,
+        'Book Chapters': 0,
+        'Conference Papers': 0,
+        'Patent': 0
+    }
+
+
+def prefilter_articles(articles, input_years):
+    """
+    Drops the articles whose listed year rules them out before their pages are fetched.
+
+    An article listed before the oldest input year would return a status of 0 for every
+    year period, so the iteration ends there. An article listed outside all the year
+    periods would return a status of 5, so it is skipped. Articles without a listed year
+    are always kept.
+
+    Args:
+        articles (iterable): The article records of a profile, newest first.
+        input_years (list): The year periods being scraped, oldest first.
+
+    Yields:
+        dict: The article records that could fall in one of the year periods.
+    """
+    for article in articles:
+        year = article['year']
+
+        if year is not None and year < input_years[0]:
+            return
+
+        if year is not None and not any(input_year <= year <= input_year + 1
+                                        for input_year in input_years):
+            checkpoint(
+                f"Checkpoint 9: Publication date is not in the correct range:\t\tArticle skipped")
+            continue
+
+        yield article
+
+
+def splice_known_articles(articles, known_articles):
+    """
+    Continues the article list with the articles known from the last run once it reaches them.
+
+    The works table is sorted by publication date, so the articles below the first one
+    already seen (the high-water mark of the last run) are the ones the last run listed.
+    They are taken from the last run instead of fetching further pages of the table. If
+    more articles are needed than the last run listed, the live list is read on, skipping
+    the articles already yielded.
+
+    Args:
+        articles (iterable): The article records of the profile as listed now, newest first.
+        known_articles (list): The article records listed in the last run, newest first.
+
+    Yields:
+        dict: The article records, newest first.
+    """
+    known_index = {article['url']: index for index, article in enumerate(known_articles)}
+    articles = iter(articles)
+
+    for article in articles:
+        index = known_index.get(article['url'])
+        if index is None:
+            yield article
+            continue
+
+        yield from known_articles[index:]
+        for article in articles:
+            if article['url'] not in known_index:
+                yield article
+        return
+
+
+def article_key(article):
+    """
+    Returns the key of the paper behind an article record, the same on every profile listing it.
+
+    Co-authors list one paper under different article URLs. It is recognized by the cluster
+    id of its "Cited by" link or, while nobody cites it, by its title, venue (both ignoring
+    case and punctuation) and listed year. Short titles such as "Editorial" are too common
+    to recognize a paper by.
+
+    Returns:
+        str: The key, or None if the paper cannot be recognized.
+    """
+    if article.get('cluster'):
+        return 'cluster:' + article['cluster']
+    title = re.findall(r'\w+', article['title'].lower())
+    if len(title) < minimum_title_words:
+        return None
+    venue = re.findall(r'\w+', article['venue'].lower())
+    return f"title:{' '.join(title)}:{' '.join(venue)}:{article['year']}"
+
+
+def year_period_of(year, month):
+    """Returns the year period (May to April) of a publication date."""
+
+    return year if month >= 5 else year - 1
+
+
+def judge_article(record, input_years):
+    """
+    Judges a scraped article against every year period.
+
+    Args:
+        record (ArticleRecord): What the article's page held (see Scraper.scrape_article),
+                                or None if its page could not be fetched.
+        input_years (list): The year periods being scraped, oldest first.
+
+    Returns:
+        dict: For every year period, a tuple of the article's counters and its return status,
+              or None if the article falls in a year period but was never classified.
+    """
+    if record is None:
+        return {input_year: (new_counters(), 3) for input_year in input_years}
+
+    year, month = record.year, record.month
+    if year is None or month is None:
+        return {input_year: (new_counters(), 2) for input_year in input_years}
+
+    results = {}
+    for input_year in input_years:
+        status_code = validate_publication_date(year, month, input_year)
+
+        if status_code != 1:
+            results[input_year] = (new_counters(), status_code)
+        elif not record.classified:
+            return None
+        else:
+            results[input_year] = (record.counters(), record.status)
+
+    return results
+
+
+def process_date(date):
+    """
+    Processes the publication date of an article (the text of its page's publication date field).
+    """
+
+    if date and date.count('/') == 2:
+        year, month, _ = date.split('/')
+        return int(year), int(month)
+
+    if date and date.count('/') == 1:
+        year, month = date.split('/')
+        return int(year), int(month)
+
+    return None, None
+
+
+def validate_publication_date(year, month, input_year):
+    """
+    Validates the publication date against the input year and range requirements.
+
+    Args:
+        year (int): The publication year of the article.
+        month (int): The publication month of the article.
+        input_year (int): The year against which to validate the publication date.
+
+    Returns:
+        int: A status code representing the validation result:
+             - 0: If the publication date is before the input year.
+             - 5: If the publication date is not in the correct range.
+             - 1: If the publication date is valid and in the correct range.
+    """
+    # Check if the publication date is before the input year
+    if (year < input_year or (year == input_year and month < 5)):
+        return 0
+
+    # Check if the publication date is in the correct range
+    if not ((year == input_year and month >= 5) or (year == input_year + 1 and month < 5)):
+        checkpoint(
+            f"Checkpoint 9: Publication date is not in the correct range:\t\tArticle skipped")
+        return 5
+
+    checkpoint(
+        f"Checkpoint 9: Publication date is in the correct range:\t\t\tArticle accepted")
+    return 1
+
+
+def process_article_fields(fields, values, counters):
+    """
+    Processes fields and values from an article and updates the counters.
+
+    Args:
+        fields (list): List of field names from the article (see parsing.field_strings).
+        values (list): List of field values from the article.
+        counters (dict): Dictionary of counters to be updated.
+
+    Returns:
+        tuple: A tuple containing the updated counters and a status code.
+    """
+    counters, status_code = classify_article_fields(fields, values, counters)
+
+    if status_code == 1:
+        checkpoint(f"Checkpoint 8: Article was scraped successfully:\t\t\t\t\tGood")
+    return counters, status_code
@@ -0,0 +1,122 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .urls import normalize_url
+
+
+class ResponseCache:
+    """
+    On-disk cache of fetched pages, one gzip file per normalized URL.
+
+    Each file starts with a line of JSON metadata (final URL, status, encoding,
+    validators and fetch time) followed by the page body. Entries older than the TTL
+    are revalidated with If-None-Match/If-Modified-Since when the server sent an ETag
+    or Last-Modified header. Reading an entry marks it as recently used, and the least
+    recently used entries are deleted once the cache grows past its size limit.
+
+    Args:
+        directory (str): The directory holding the cache files.
+        ttl (float): Seconds an entry is served without asking the server again.
+        max_bytes (int): Size of the cache files above which old entries are evicted.
+    """
+
+    def __init__(self, directory, ttl, max_bytes):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.size = sum(entry.stat().st_size for entry in os.scandir(directory)
+                        if entry.name.endswith('.gz'))
+
+    def path(self, url):
+        key = hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, key + '.gz')
+
+    def load(self, url):
+        """Returns the (metadata, body) of the cached URL, or None if it is not cached."""
+
+        path = self.path(url)
+        try:
+            with gzip.open(path, 'rb') as file:
+                meta = json.loads(file.readline())
+                body = file.read()
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return meta, body
+
+    def is_fresh(self, meta):
+        return time.time() - meta['fetched_at'] < self.ttl
+
+    def store(self, url, response):
+        """Saves a successful response under the requested URL."""
+
+        meta = {
+            'url': response.url,
+            'status': response.status_code,
+            'encoding': response.encoding,
+            'content_type': response.headers.get('Content-Type'),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': time.time()
+        }
+        self.write(url, meta, response.content)
+
+    def refresh(self, url, meta, body):
+        """Marks a revalidated entry as freshly fetched."""
+
+        meta = dict(meta, fetched_at=time.time())
+        self.write(url, meta, body)
+        return meta
+
+    def write(self, url, meta, body):
+        path = self.path(url)
+        data = gzip.compress(json.dumps(meta).encode('utf-8') + b'\n' + body)
+
+        with self.lock:
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as file:
+                file.write(data)
+            os.replace(temp_path, path)
+            self.size += len(data) - old_size
+
+            if self.size > self.max_bytes:
+                self.evict()
+
+    def evict(self):
+        """Deletes the least recently used entries until the cache is back under 90% of its limit."""
+
+        entries = sorted((entry for entry in os.scandir(self.directory)
+                          if entry.name.endswith('.gz')),
+                         key=lambda entry: entry.stat().st_mtime)
+        for entry in entries:
+            if self.size <= self.max_bytes * 0.9:
+                break
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except OSError:
+                continue
+            self.size -= size
+
+
+def build_cached_response(meta, body):
+    """Rebuilds a requests.Response from a cache entry."""
+
+    response = requests.Response()
+    response.status_code = meta['status']
+    response.url = meta['url']
+    response.encoding = meta['encoding']
+    response.headers = CaseInsensitiveDict(
+        {'Content-Type': meta['content_type'] or 'text/html'})
+    response._content = body
+    return response
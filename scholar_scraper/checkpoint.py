@@ -0,0 +1,122 @@
+import json
+import os
+import threading
+
+from .diagnostics import checkpoint, manual_inspection_required, INPUT_INVALID
+from .records import ArticleRecord
+
+
+class CheckpointError(Exception):
+    """Raised when a checkpoint journal cannot be used to resume the run."""
+
+
+class CheckpointJournal:
+    """
+    Append-only journal of the work finished in a run, used to resume it after a failure.
+
+    Every applied article (with what its page held) and every profile written to the outputs (with its
+    article rows) is added as one JSON line, and an end record once the run completes.
+    When resuming, the rows of finished profiles are written again and the journaled
+    articles of an unfinished profile are reused instead of fetched. The rows are read
+    back from the file as they are needed, so resuming a long run needs little memory.
+
+    Args:
+        path (str): The journal file.
+        resume (bool): Continue the journal of the previous run instead of starting a new one.
+        input_years (list): The year periods of the run.
+        read_only (bool): Only load the journal (e.g. to merge shards); nothing can be added.
+
+    Raises:
+        CheckpointError: If the journal to resume was written for other years.
+    """
+
+    def __init__(self, path, resume, input_years, read_only=False):
+        self.path = path
+        self.input_years = input_years
+        self.size = 0  # Bytes of the journal written by the previous runs
+        self.profiles = 0  # Number of finished profiles
+        self.article_records = {}  # (profile URL, article URL) -> ArticleRecord of the unfinished profiles
+        self.finished = False  # Whether the journaled run completed
+        self.lock = threading.Lock()
+
+        resuming = resume and os.path.exists(path)
+        if resuming:
+            self.load()
+
+        if read_only:
+            self.file = None
+            return
+
+        self.file = open(path, 'a' if resuming else 'w', encoding='utf-8')
+        if resuming:
+            # Start on a fresh line in case the last record was cut off by the failure
+            self.file.write('\n')
+        else:
+            self.write({'type': 'run', 'input_years': input_years})
+
+    def load(self):
+        self.size = os.path.getsize(self.path)
+        unfinished = {}  # profile URL -> {article URL: page record JSON} of the profiles without a profile record
+
+        for record in self.records():
+            if record['type'] == 'run' and record['input_years'] != self.input_years:
+                manual_inspection_required(
+                    f"Checkpoint journal was written for the years {record['input_years']}, not {self.input_years}", "checkpoint file", self.path, INPUT_INVALID)
+                raise CheckpointError(
+                    f"Checkpoint journal {self.path} belongs to other years")
+            elif record['type'] == 'article' and 'record' in record:
+                unfinished.setdefault(record['profile'], {})[record['article']] = record['record']
+            elif record['type'] == 'end':
+                self.finished = True
+            elif record['type'] == 'profile':
+                self.profiles += 1
+                unfinished.pop(record['profile'], None)
+
+        # Articles whose page could not be fetched are left out, so they are fetched again
+        self.article_records = {
+            (profile_url, article_url): ArticleRecord.from_json(article_record)
+            for profile_url, articles in unfinished.items()
+            for article_url, article_record in articles.items() if article_record}
+
+        checkpoint(
+            f"Checkpoint 13: Resuming after {self.profiles} profiles:\t\t\t\t\tGood")
+
+    def records(self):
+        """Yields the records written by the previous runs (not those added since)."""
+
+        with open(self.path, 'rb') as file:
+            offset = 0
+            for line in file:
+                offset += len(line)
+                if offset > self.size:
+                    return
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def profile_rows(self):
+        """Yields the (profile URL, row, article rows) of every finished profile, in order."""
+
+        for record in self.records():
+            if record['type'] == 'profile':
+                yield record['profile'], record['row'], record['articles']
+
+    def write(self, record):
+        with self.lock:
+            self.file.write(json.dumps(record) + '\n')
+            self.file.flush()
+
+    def record_article(self, profile_url, article_url, article_record):
+        self.write({'type': 'article', 'profile': profile_url, 'article': article_url,
+                    'record': article_record.to_json() if article_record else None})
+
+    def record_profile(self, profile_url, row, article_rows):
+        self.write({'type': 'profile', 'profile': profile_url, 'row': row,
+                    'articles': article_rows})
+
+    def record_end(self):
+        self.write({'type': 'end'})
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import re
+from .keywords import (conference_keywords, ignored_keywords, citations_keywords,
+                       preprint_keywords, journal_keywords, book_keywords,
+                       book_chapter_keywords, patent_keywords)
+
+# Bit flags for the keyword sets in keywords.py
+IGNORED = 1
+CONFERENCE = 2
+PREPRINT = 4
+JOURNAL = 8
+BOOK = 16
+BOOK_CHAPTER = 32
+PATENT = 64
+CITATIONS = 128
+
+# Fields matching none of these make the article type unrecognized
+KNOWN_FIELDS = CITATIONS | PREPRINT | JOURNAL | CONFERENCE | BOOK | PATENT
+
+
+class KeywordMatcher:
+    """
+    Finds which keyword sets occur in a text with one regular expression search.
+
+    The pattern is a lookahead alternation of every keyword, longest first, tried at
+    each position of the text. At any position every keyword that matches is a prefix
+    of the longest one that matches there, so each keyword is given the flags of all
+    the keywords it starts with. This gives the same result as testing
+    `keyword in text` for every keyword of every set.
+
+    Args:
+        keyword_sets (dict): Maps each flag to its set of keywords.
+    """
+
+    def __init__(self, keyword_sets):
+        keywords = {keyword for keyword_set in keyword_sets.values()
+                    for keyword in keyword_set}
+        self.flags = {}
+        for keyword in keywords:
+            self.flags[keyword] = 0
+            for flag, keyword_set in keyword_sets.items():
+                if any(keyword.startswith(other) for other in keyword_set):
+                    self.flags[keyword] |= flag
+
+        alternatives = '|'.join(re.escape(keyword) for keyword in
+                                sorted(keywords, key=len, reverse=True))
+        self.pattern = re.compile(f'(?=({alternatives}))')
+
+    def match(self, text):
+        """Returns the flags of every keyword set with a keyword in the text."""
+
+        flags = 0
+        for keyword in self.pattern.findall(text):
+            flags |= self.flags[keyword]
+        return flags
+
+
+# Field names are lowercased before matching, so only the lowercase keywords can match
+field_matcher = KeywordMatcher({
+    flag: {keyword.lower() for keyword in keyword_set}
+    for flag, keyword_set in ((IGNORED, ignored_keywords),
+                              (CONFERENCE, conference_keywords),
+                              (PREPRINT, preprint_keywords),
+                              (JOURNAL, journal_keywords),
+                              (BOOK, book_keywords),
+                              (BOOK_CHAPTER, book_chapter_keywords),
+                              (PATENT, patent_keywords),
+                              (CITATIONS, citations_keywords))
+})
+
+# Values are matched as written (case-sensitive), so every variant in keywords.py counts
+value_matcher = KeywordMatcher({
+    CONFERENCE: conference_keywords,
+    PREPRINT: preprint_keywords
+})
+
+
+def keywords_version():
+    """Returns a 16-byte hash of the keyword sets, which changes whenever keywords.py is edited."""
+
+    keyword_sets = [conference_keywords, ignored_keywords, citations_keywords, preprint_keywords,
+                    journal_keywords, book_keywords, book_chapter_keywords, patent_keywords]
+    data = json.dumps([sorted(keyword_set) for keyword_set in keyword_sets]).encode('utf-8')
+    return hashlib.sha256(data).digest()[:16]
+
+
+def classify_article_fields(fields, values, counters):
+    """
+    Updates the counters from the fields and values of an article.
+
+    Args:
+        fields (list): List of field names from the article (see parsing.field_strings).
+        values (list): List of field values (the markup of their elements) from the article.
+        counters (dict): Dictionary of counters to be updated.
+
+    Returns:
+        tuple: A tuple containing the updated counters and a status code
+               (1 if the article was classified, 4 if a field was not recognized).
+    """
+    first_positions = None
+
+    for field, value in zip(fields, values):
+        field_flags = field_matcher.match(field.lower().strip())
+
+        # Check for ignored fields
+        if field_flags & IGNORED:
+            continue
+
+        value_flags = value_matcher.match(value)
+
+        # Handle conference-related keywords
+        if field_flags & CONFERENCE or (value and value_flags & CONFERENCE):
+            counters['Conference Papers'] += 1
+
+        # Handle preprint-related keywords
+        elif value and value_flags & PREPRINT:
+            counters['arXiv Preprint'] += 1
+
+        # Handle journal-related keywords
+        elif field_flags & JOURNAL and 'preprint' not in value.lower():
+            counters['Peer Reviewed Articles'] += 1
+
+        # Handle book-related keywords
+        elif field_flags & BOOK:
+            counters['Books'] += 1
+
+            # The next field is looked up from the first field equal to this one
+            if first_positions is None:
+                first_positions = {}
+                for position, other_field in enumerate(fields):
+                    first_positions.setdefault(other_field, position)
+
+            # Check if the next field is a book chapter and only count it as a book chapter
+            next_field_index = first_positions[field] + 1
+            if next_field_index < len(fields):
+                next_field_flags = field_matcher.match(
+                    fields[next_field_index].lower().strip())
+                next_value = values[next_field_index]
+                if next_field_flags & BOOK_CHAPTER and next_value:
+                    counters['Book Chapters'] += 1
+                    counters['Books'] -= 1
+
+        # Handle patent-related keywords
+        elif field_flags & PATENT:
+            counters['Patent'] += 1
+
+        # Handle cases that don't match any known keyword
+        elif not (field_flags & KNOWN_FIELDS or value_flags & (CONFERENCE | PREPRINT)):
+            return counters, 4
+
+    return counters, 1
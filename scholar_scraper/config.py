@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class ScraperConfig:
+    """
+    Settings of a scraping job.
+
+    Every setting has a default, except the year periods, which must be set before a run
+    through input_year (one period) or input_years (several periods scraped in one pass).
+    input_year then holds the latest period. requests_per_second defaults to one request
+    per average sleep time.
+    """
+
+    input_year: int = None  # The year period (May to April) to scrape
+    input_years: list = None  # Every year period to scrape, oldest first (defaults to [input_year])
+    test_mode: bool = False  # Set to True to enable test mode
+    checkpoint_file: str = 'checkpoint.jsonl'  # Journal of finished work, used by --resume
+    summary_file: str = 'summary.csv'  # Totals and averages of the profiles so far, rewritten after each profile (None to skip)
+    output_batch_size: int = 100  # Rows buffered per output table before they are written
+    state_file: str = 'profile_state.jsonl'  # What the last scrape of each profile found, used by delta runs (None to skip)
+    delta: bool = False  # Only fetch the articles listed above those known from the last scrape of each profile
+    share_articles: bool = True  # Scrape a paper listed on several profiles once, reusing it for the co-authors
+    article_cache_file: str = None  # Keeps the shared articles between runs too (None to keep them for the run only)
+    citation_export: str = None  # Classify the articles from each profile's citation export in this format ('ris' or 'bibtex'), fetching only the pages of the entries it does not settle (None to fetch every article page)
+    inspection_report: str = 'inspection_report.jsonl'  # Record of every manual inspection notice of a run, with its reason code, profile and article (.sqlite/.db for an SQLite database; None to skip)
+    metrics_file: str = None  # JSON report of the time, bytes, waits and retries of every stage, written at the end of a run (None to skip)
+    sleep_time_minimum: float = 1  # Minimum sleep time in seconds
+    sleep_time_maximum: float = 3  # Maximum sleep time in seconds
+    max_concurrent_requests: int = 4  # Number of article requests kept in flight at once
+    prefetch_profiles: int = 2  # Number of upcoming profiles whose first page is requested while the current profile is scraped
+    requests_per_second: float = None  # Shared rate budget for all scholar.google.* hosts
+    request_burst: int = 2  # Number of requests that can be sent back to back
+    minimum_requests_per_second: float = 0.05  # Slowest rate the scraper backs off to when Scholar blocks it
+    egress_endpoints: list = None  # Proxies (and header sets) to spread the requests over, each with its own rate budget (see egress.py; None to connect directly)
+    egress_quarantine: float = 600  # Seconds an egress endpoint is left out after being blocked repeatedly
+    max_retries: int = 4  # Times a failed or blocked request is retried
+    retry_backoff: float = 5  # Seconds before the first retry (doubled for each further retry)
+    max_retry_delay: float = 300  # Longest wait before a retry, including waits asked for by Retry-After
+    works_page_size: int = 100  # Articles per page of the works list (100 is the largest Scholar serves)
+    html_parser_backend: str = 'auto'  # 'auto' (lxml when installed), 'lxml', 'html5lib' or 'html.parser'
+    parse_only_needed_elements: bool = True  # Only build the parts of each page that are read
+    connect_timeout: float = 10  # Seconds to wait for a connection to Google Scholar
+    read_timeout: float = 30  # Seconds to wait for Google Scholar to send data
+    use_cache: bool = True  # Keep fetched pages on disk and reuse them on later runs
+    offline_replay: bool = False  # Only use cached pages (no requests to Google Scholar)
+    cache_directory: str = '.scholar_cache'  # Folder holding the cached pages
+    cache_ttl: float = 7 * 24 * 60 * 60  # Seconds a cached page is reused before asking Scholar again
+    cache_max_megabytes: float = 500  # Size of the cache above which the least recently used pages are deleted
+    user_agent: str = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+    def __post_init__(self):
+        if self.input_years:
+            self.input_years = sorted(set(self.input_years))
+            self.input_year = self.input_years[-1]
+        elif self.input_year is not None:
+            self.input_years = [self.input_year]
+
+        if self.requests_per_second is None:
+            self.requests_per_second = 2 / \
+                (self.sleep_time_minimum + self.sleep_time_maximum)
+
+    @property
+    def since_input_year(self):
+        """The first year of Scholar's 'Since' column (five years before the end of the latest period)."""
+
+        return self.input_year - 4
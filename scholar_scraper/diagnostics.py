@@ -0,0 +1,223 @@
+"""
+Messages printed while scraping: test mode checkpoints and manual inspection notices.
+
+The messages are not printed by the thread that logs them: they are queued and a
+background thread prints them in order, so a fetch worker never waits on a slow
+terminal or log file. The manual inspection notices are also written as records of the
+inspection report (JSON lines, or a table of an SQLite database), for tools to query.
+"""
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timezone
+
+test_mode = False  # Set through ScraperConfig.test_mode
+
+# Reason codes of the inspection records. The codes of article issues are the return
+# status the article got (see articles.judge_article); the others follow from 10.
+NO_COUNTS_UPDATED = 1
+DATE_FORMAT_INVALID = 2
+ARTICLE_FETCH_FAILED = 3
+ARTICLE_FIELD_UNRECOGNIZED = 4
+PROFILE_URL_INVALID = 10  # The profile URL is empty, not a Scholar URL or does not resolve
+PROFILE_FETCH_FAILED = 11  # A page of the profile could not be fetched
+PROFILE_DATA_MISSING = 12  # The name, h-indices or citation counts are not on the profile
+ARTICLE_LIST_INCOMPLETE = 13  # The works list could not be read to its end
+INPUT_INVALID = 14  # An input file, checkpoint journal or shard is not usable
+
+report_columns = ('time', 'code', 'issue', 'profile', 'article', 'location_type', 'location')
+
+messages = queue.SimpleQueue()  # Messages, inspection records and flush events, in order
+writer = None  # The thread printing the messages
+writer_lock = threading.Lock()
+report = None  # The open inspection report, used only by the writer thread
+current_profile = None  # The profile URL being scraped, set by the scraper
+
+
+def set_test_mode(enabled):
+    """Turns the test mode checkpoint messages on or off."""
+
+    global test_mode
+    test_mode = enabled
+
+
+def set_profile(url):
+    """Sets the profile the inspection records are filed under when they do not name one."""
+
+    global current_profile
+    current_profile = url
+
+
+def write_messages():
+    while True:
+        kind, item = messages.get()
+        try:
+            if kind == 'message':
+                print(item)
+            elif kind == 'record':
+                if report:
+                    report.write(item)
+            elif kind == 'open':
+                open_report(*item)
+            elif kind == 'close':
+                close_report()
+            elif kind == 'flush':
+                sys.stdout.flush()
+        except Exception as e:
+            print(f"Error writing the inspection report: {e}", file=sys.stderr)
+        finally:
+            if kind == 'flush':
+                item.set()
+
+
+def enqueue(kind, item):
+    global writer
+    if writer is None:
+        with writer_lock:
+            if writer is None:
+                writer = threading.Thread(target=write_messages, name='diagnostics', daemon=True)
+                writer.start()
+    messages.put((kind, item))
+
+
+def log(message=''):
+    """Prints a message, without waiting for it to be written."""
+
+    enqueue('message', message)
+
+
+def flush():
+    """Waits until every message logged so far has been written."""
+
+    if writer is None:
+        return
+    done = threading.Event()
+    enqueue('flush', done)
+    done.wait()
+
+
+atexit.register(flush)
+
+
+def reset_after_fork():
+    # A forked process (e.g. a shard) starts without the writer thread of its parent
+    global messages, writer, writer_lock, report
+    messages = queue.SimpleQueue()
+    writer = None
+    writer_lock = threading.Lock()
+    report = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset_after_fork)
+
+
+def checkpoint(message):
+    """Prints a checkpoint message when test mode is enabled."""
+
+    if test_mode:
+        log(message)
+
+
+def manual_inspection_required(issue, location_type, location, code=None, profile=None,
+                               article=None):
+    """
+    Prints a manual inspection notice and adds it to the inspection report.
+
+    Args:
+        issue (str): What needs to be inspected.
+        location_type (str): What location is (e.g. 'profile URL').
+        location: Where the issue is: a URL, a path or an exception.
+        code (int): The reason code of the issue (see the constants above).
+        profile (str): The profile URL of the issue (defaults to the profile being scraped).
+        article (str): The article URL of the issue, if it is about an article.
+    """
+    log(f"MANUAL INSPECTION REQUIRED:\n{issue}: Bad\nProblematic {location_type}:\n{location}\n\n")
+    enqueue('record', {
+        'time': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+        'code': code,
+        'issue': issue,
+        'profile': profile or current_profile,
+        'article': article,
+        'location_type': location_type,
+        'location': None if location is None else str(location)
+    })
+
+
+class JsonLinesReport:
+    """Inspection report of one JSON record per line."""
+
+    def __init__(self, path, append):
+        self.file = open(path, 'a' if append else 'w', encoding='utf-8')
+
+    def write(self, record):
+        self.file.write(json.dumps(record) + '\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class SQLiteReport:
+    """Inspection report kept in the 'inspections' table of an SQLite database."""
+
+    def __init__(self, path, append):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS inspections (time TEXT, code INTEGER, issue TEXT, '
+            'profile TEXT, article TEXT, location_type TEXT, location TEXT)')
+        if not append:
+            self.connection.execute('DELETE FROM inspections')
+        self.connection.commit()
+
+    def write(self, record):
+        self.connection.execute(
+            f"INSERT INTO inspections VALUES ({', '.join('?' * len(report_columns))})",
+            [record[column] for column in report_columns])
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+
+report_types = {
+    '.jsonl': JsonLinesReport,
+    '.sqlite': SQLiteReport,
+    '.db': SQLiteReport
+}
+
+
+def open_report(path, append=False):
+    global report
+    close_report()
+    extension = os.path.splitext(path)[1].lower()
+    report = report_types.get(extension, JsonLinesReport)(path, append)
+
+
+def close_report():
+    global report
+    if report:
+        report.close()
+        report = None
+
+
+def start_report(path, append=False):
+    """
+    Starts writing the manual inspection notices to an inspection report.
+
+    Args:
+        path (str): The report file: .sqlite or .db for an SQLite database, otherwise JSON lines.
+        append (bool): Keep the records already in the report (e.g. when a run is resumed).
+    """
+    enqueue('open', (path, append))
+
+
+def end_report():
+    """Writes the notices logged so far to the inspection report, then closes it."""
+
+    enqueue('close', None)
+    flush()
@@ -0,0 +1,251 @@
+"""
+Classifying articles from a profile's citation export instead of their article pages.
+
+Scholar exports the selected works of a profile as BibTeX or RIS in one request. Each
+exported entry is turned back into the fields its article page shows (Journal,
+Conference, Book, Pages, ...), which are then dated and classified exactly as a fetched
+article page would be. Entries that do not say everything the article page would (no
+publication month, or an entry type or field whose place on the page is not known) are
+left out, and their article pages are fetched as usual.
+"""
+import html
+import re
+
+# Scholar's cit_fmt codes of the export formats that can be read
+export_formats = {'bibtex': 0, 'ris': 2}
+
+# Entry types whose fields are known to match their article page
+known_entry_types = {'article', 'inproceedings', 'conference', 'book', 'incollection', 'inbook',
+                     'techreport'}
+
+# Entry fields -> the article page field showing them
+page_fields = {
+    'journal': 'Journal',
+    'volume': 'Volume',
+    'number': 'Issue',
+    'pages': 'Pages',
+    'chapter': 'Book chapter',
+    'publisher': 'Publisher',
+    'institution': 'Institution'
+}
+
+# Order of the fields on an article page (the classifier looks at the field after a Book)
+page_field_order = ['Conference', 'Journal', 'Book', 'Book chapter', 'Volume', 'Issue', 'Pages',
+                    'Publisher', 'Institution']
+
+# Entry fields that are not shown among the article page fields that are classified
+unshown_fields = {'author', 'title', 'year', 'month', 'day', 'date', 'url', 'doi', 'isbn',
+                  'issn', 'abstract', 'keywords', 'language'}
+
+month_names = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+
+# RIS reference types -> BibTeX entry types
+ris_entry_types = {
+    'JOUR': 'article', 'JFULL': 'article', 'EJOUR': 'article', 'CONF': 'inproceedings',
+    'CPAPER': 'inproceedings', 'BOOK': 'book', 'EBOOK': 'book', 'CHAP': 'incollection',
+    'ECHAP': 'incollection', 'RPRT': 'techreport', 'PAT': 'patent', 'THES': 'phdthesis'
+}
+
+# RIS tags -> BibTeX fields ('T2', the journal or book, and 'PB', the publisher or
+# institution, depend on the entry type)
+ris_fields = {
+    'TI': 'title', 'T1': 'title', 'AU': 'author', 'A1': 'author', 'JO': 'journal',
+    'JF': 'journal', 'VL': 'volume', 'IS': 'number', 'PB': 'publisher', 'SN': 'issn',
+    'UR': 'url', 'DO': 'doi', 'AB': 'abstract', 'KW': 'keywords', 'N1': 'note', 'CY': 'address', 'SE': 'chapter'
+}
+
+
+def parse_month(text):
+    text = text.strip().strip('{}"').lower()
+    if text.isdigit() and 1 <= int(text) <= 12:
+        return int(text)
+    if text[:3] in month_names:
+        return month_names.index(text[:3]) + 1
+    return None
+
+
+def parse_bibtex(text):
+    """
+    Parses BibTeX entries.
+
+    Returns:
+        list: The entries, as dicts with the entry 'type', its 'fields' (name -> value,
+              lowercased names) and its publication 'year' and 'month' (None if not given).
+    """
+    entries = []
+    position = 0
+    while True:
+        match = re.compile(r'@(\w+)\s*\{').search(text, position)
+        if not match:
+            return entries
+
+        entry_type = match.group(1).lower()
+        position = match.end()
+        fields = {}
+
+        # Skip the citation key
+        comma = text.find(',', position)
+        closing = text.find('}', position)
+        if comma == -1 or (closing != -1 and closing < comma):
+            position = closing + 1 if closing != -1 else len(text)
+            continue
+        position = comma + 1
+
+        while True:
+            field = re.compile(r'\s*(\w+)\s*=\s*').match(text, position)
+            if not field:
+                break
+            name = field.group(1).lower()
+            position = field.end()
+            value, position = read_bibtex_value(text, position)
+            fields[name] = ' '.join(value.split())
+            separator = re.compile(r'\s*,?').match(text, position)
+            position = separator.end()
+
+        closing = text.find('}', position)
+        position = closing + 1 if closing != -1 else len(text)
+
+        year = fields.get('year', '')
+        entries.append({
+            'type': entry_type,
+            'fields': fields,
+            'year': int(year) if year.isdigit() else None,
+            'month': parse_month(fields['month']) if 'month' in fields else None
+        })
+
+
+def read_bibtex_value(text, position):
+    """Returns a BibTeX field value starting at position (braced, quoted or bare) and the position after it."""
+
+    if position < len(text) and text[position] in '{"':
+        closing = '}' if text[position] == '{' else '"'
+        depth = 0
+        start = position + 1
+        for index in range(position, len(text)):
+            character = text[index]
+            if character == '{':
+                depth += 1
+            elif character == '}' and closing == '}':
+                depth -= 1
+                if depth == 0:
+                    return text[start:index].replace('{', '').replace('}', ''), index + 1
+            elif character == '"' and closing == '"' and index > position and depth == 0:
+                return text[start:index].replace('{', '').replace('}', ''), index + 1
+        return text[start:], len(text)
+
+    match = re.compile(r'[^,}\s]*').match(text, position)
+    return match.group(), match.end()
+
+
+def parse_ris(text):
+    """
+    Parses RIS records.
+
+    Returns:
+        list: The entries, as parse_bibtex returns them (the RIS types and tags are
+              turned into their BibTeX types and fields).
+    """
+    entries = []
+    tags = None
+    for line in text.splitlines():
+        match = re.match(r'([A-Z][A-Z0-9])  -( (.*))?$', line.rstrip())
+        if not match:
+            continue
+        tag, value = match.group(1), (match.group(3) or '').strip()
+
+        if tag == 'TY':
+            tags = {'TY': value}
+        elif tags is None:
+            continue
+        elif tag == 'ER':
+            entries.append(ris_entry(tags))
+            tags = None
+        elif tag in ('AU', 'A1') and tag in tags:
+            tags[tag] += ' and ' + value
+        else:
+            tags.setdefault(tag, value)
+
+    return entries
+
+
+def ris_entry(tags):
+    entry_type = ris_entry_types.get(tags['TY'], 'misc')
+    fields = {}
+    for tag, value in tags.items():
+        if tag == 'PB' and entry_type == 'techreport':
+            fields['institution'] = value
+        elif tag in ris_fields:
+            fields.setdefault(ris_fields[tag], value)
+        elif tag == 'T2':
+            fields.setdefault('journal' if entry_type == 'article' else 'booktitle', value)
+        elif tag not in ('TY', 'SP', 'EP', 'PY', 'Y1', 'DA'):
+            fields[tag.lower()] = value
+
+    if 'SP' in tags:
+        fields['pages'] = f"{tags['SP']}-{tags['EP']}" if tags.get('EP') else tags['SP']
+
+    # The date is YYYY/MM/DD/other info, any part of which may be missing
+    year = month = None
+    for tag in ('DA', 'Y1', 'PY'):
+        parts = tags.get(tag, '').split('/')
+        if parts[0].strip().isdigit():
+            year = int(parts[0])
+            month = parse_month(parts[1]) if len(parts) > 1 and parts[1].strip() else None
+            if month:
+                break
+
+    return {'type': entry_type, 'fields': fields, 'year': year, 'month': month}
+
+
+def parse_export(text, export_format):
+    """Parses a citation export in the given format ('bibtex' or 'ris')."""
+
+    return parse_ris(text) if export_format == 'ris' else parse_bibtex(text)
+
+
+def normalize_title(title):
+    """Returns a title lowercased and without punctuation, to match exported entries to articles."""
+
+    return ' '.join(re.findall(r'\w+', title.lower()))
+
+
+def entry_page_fields(entry):
+    """
+    Returns the (field, value) pairs the article page of an exported entry shows.
+
+    Returns:
+        list: The pairs, in the order of the article page, or None if the entry does not
+              tell everything its article page would (so the page must be fetched instead).
+    """
+    if entry['type'] not in known_entry_types or entry['year'] is None or entry['month'] is None:
+        return None
+
+    fields = entry['fields']
+    shown = {}
+    if entry['type'] == 'book' and 'booktitle' not in fields:
+        shown['Book'] = fields.get('title', '')
+
+    for name, value in fields.items():
+        if name == 'booktitle':
+            shown['Conference' if entry['type'] in ('inproceedings', 'conference')
+                  else 'Book'] = value
+        elif name in page_fields:
+            shown[page_fields[name]] = value
+        elif name not in unshown_fields:
+            return None
+
+    pairs = []
+    if fields.get('author'):
+        pairs.append(('Authors', fields['author'].replace(' and ', ', ')))
+    pairs.append(('Publication date', f"{entry['year']}/{entry['month']}"))
+    pairs.extend((field, shown[field]) for field in page_field_order if field in shown)
+    return pairs
+
+
+def render_article_table(pairs):
+    """Returns the HTML of an article page's field table holding the given (field, value) pairs."""
+
+    rows = ''.join(f'<div class="gs_scl"><div class="gsc_oci_field">{html.escape(field)}</div>'
+                   f'<div class="gsc_oci_value">{html.escape(value)}</div></div>'
+                   for field, value in pairs)
+    return f'<html><body><div id="gsc_oci_table">{rows}</div></body></html>'
@@ -0,0 +1,305 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import make_headers
+
+from .cache import ResponseCache, build_cached_response
+from .diagnostics import checkpoint, log
+from .egress import EgressPool
+from .instrumentation import Instrumentation
+
+
+class ScholarBlockedError(requests.RequestException):
+    """Raised when Google Scholar keeps answering with a 429 or an "unusual traffic" page."""
+
+
+# Text that only appears on Google's CAPTCHA / "unusual traffic" interstitial pages
+interstitial_markers = ('id="gs_captcha_f"', 'id="captcha-form"',
+                        'unusual traffic from your computer network',
+                        "Please show you're not a robot")
+
+
+def detect_block(response):
+    """
+    Checks whether a response is Google pushing back rather than the requested page.
+
+    Returns:
+        str: A short description of the block, or None if the response is not blocked.
+    """
+    if response.status_code == 429:
+        return "HTTP 429"
+    if '/sorry/' in response.url:
+        return "redirected to the CAPTCHA page"
+    content_type = response.headers.get('Content-Type', '')
+    if 'html' in content_type and any(marker in response.text for marker in interstitial_markers):
+        return "unusual traffic page"
+    return None
+
+
+def parse_retry_after(response, max_delay):
+    """Returns the delay requested by a Retry-After header in seconds (at most max_delay), or None."""
+
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    if value.strip().isdigit():
+        delay = int(value)
+    else:
+        try:
+            delay = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max_delay, max(0, delay))
+
+
+def backoff_delay(attempt, base, max_delay):
+    """Returns the exponential backoff before a retry, with jitter so threads do not retry together."""
+
+    return min(max_delay, base * 2 ** attempt) * random.uniform(0.5, 1.5)
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter that reports every request and every newly opened connection to a Fetcher.
+
+    Args:
+        fetcher (Fetcher): The fetcher collecting the connection statistics.
+    """
+
+    def __init__(self, fetcher, **kwargs):
+        self.fetcher = fetcher
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = self.counting_pool_classes()
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        if hasattr(manager, 'pool_classes_by_scheme'):
+            manager.pool_classes_by_scheme = self.counting_pool_classes()
+        return manager
+
+    def counting_pool_classes(self):
+        fetcher = self.fetcher
+
+        class CountingHTTPConnectionPool(HTTPConnectionPool):
+            def _new_conn(self):
+                fetcher.record_stat('connections_opened')
+                return super()._new_conn()
+
+        class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+            def _new_conn(self):
+                fetcher.record_stat('connections_opened')
+                return super()._new_conn()
+
+        return {
+            'http': CountingHTTPConnectionPool,
+            'https': CountingHTTPSConnectionPool
+        }
+
+    def send(self, request, **kwargs):
+        self.fetcher.record_stat('requests')
+        return super().send(request, **kwargs)
+
+
+class Fetcher:
+    """
+    Shared HTTP client used for every request to Google Scholar.
+
+    Keeps connections alive in a pool sized for the article concurrency, negotiates
+    compressed responses, applies one header set and default connect/read timeouts,
+    and draws every request from the host's rate budget. With egress endpoints
+    configured, each request instead goes out through the endpoint the EgressPool
+    picks, drawing from that endpoint's budget. Pages are served from the response
+    cache when one is given. The time, bytes, waits and retries of every request are
+    recorded under the 'fetch' stage of the instrumentation.
+
+    Args:
+        config (ScraperConfig): The timeouts, retry, cache and header settings.
+        rate_limiters (RateLimiters): The rate budgets the requests are drawn from.
+        instrumentation (Instrumentation): Where the measures are recorded (a new one by default).
+    """
+
+    def __init__(self, config, rate_limiters, instrumentation=None):
+        self.config = config
+        self.rate_limiters = rate_limiters
+        self.instrumentation = instrumentation or Instrumentation()
+        self.timeout = (config.connect_timeout, config.read_timeout)
+        self.offline = config.offline_replay
+        self.egress = EgressPool(config) if config.egress_endpoints else None
+        self.cache = None
+        if config.use_cache or config.offline_replay:
+            self.cache = ResponseCache(config.cache_directory, config.cache_ttl,
+                                       config.cache_max_megabytes * 1024 * 1024)
+        self.stats = {
+            'requests': 0,
+            'connections_opened': 0,
+            'bytes_transferred': 0,
+            'bytes_decoded': 0,
+            'cache_hits': 0,
+            'cache_revalidated': 0,
+            'retries': 0,
+            'blocks': 0
+        }
+        self.stats_lock = threading.Lock()
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': config.user_agent,
+            'Accept-Encoding': make_headers(accept_encoding=True)['accept-encoding']
+        })
+        pool_size = config.max_concurrent_requests + 1
+        adapter = CountingHTTPAdapter(
+            self, pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def record_stat(self, name, amount=1):
+        with self.stats_lock:
+            self.stats[name] += amount
+
+    def reset_stats(self):
+        with self.stats_lock:
+            for name in self.stats:
+                self.stats[name] = 0
+
+    def get(self, url, **kwargs):
+        """Returns the cached page or sends a GET request once the rate budget allows it."""
+
+        cached = self.cache.load(url) if self.cache else None
+        if cached and (self.offline or self.cache.is_fresh(cached[0])):
+            self.record_stat('cache_hits')
+            return build_cached_response(*cached)
+
+        if self.offline:
+            raise requests.ConnectionError(f"Offline replay: page is not cached: {url}")
+
+        # Ask the server whether a stale entry is still current
+        if cached:
+            meta = cached[0]
+            headers = dict(kwargs.pop('headers', None) or {})
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+            kwargs['headers'] = headers
+
+        kwargs.setdefault('timeout', self.timeout)
+        with self.instrumentation.timed('fetch'):
+            response = self.send_with_retries(url, **kwargs)
+
+        if cached and response.status_code == 304:
+            self.record_stat('cache_revalidated')
+            meta = self.cache.refresh(url, *cached)
+            return build_cached_response(meta, cached[1])
+
+        # Count the compressed bytes read from the socket for every hop, redirects included
+        transferred = 0
+        for hop in response.history + [response]:
+            tell = getattr(hop.raw, 'tell', None)
+            if tell:
+                transferred += tell()
+        self.record_stat('bytes_transferred', transferred)
+        self.record_stat('bytes_decoded', len(response.content))
+        self.instrumentation.record('fetch', 'bytes', transferred)
+
+        if self.cache and response.status_code == 200:
+            self.cache.store(url, response)
+        return response
+
+    def send_with_retries(self, url, **kwargs):
+        """
+        Sends a GET request, retrying connection errors, server errors and blocks.
+
+        Retries wait for the Retry-After delay when Scholar gives one and back off
+        exponentially otherwise. A 429 or CAPTCHA page also slows down the shared rate
+        budget, so every thread backs off, not only the one that was blocked. With an
+        egress pool, only the blocked endpoint's budget slows down, its health drops, and
+        the retry goes out through whichever endpoint the pool picks then.
+
+        Raises:
+            ScholarBlockedError: If Scholar is still blocking the request after the last retry.
+        """
+        config = self.config
+        instrumentation = self.instrumentation
+        bucket = self.rate_limiters.get(url)
+        attempt = 0
+
+        try:
+            while True:
+                endpoint = self.egress.choose() if self.egress else None
+                request_kwargs = kwargs
+                if endpoint:
+                    bucket = endpoint.bucket
+                    request_kwargs = dict(kwargs, proxies=endpoint.proxies,
+                                          headers={**endpoint.headers, **(kwargs.get('headers') or {})})
+
+                instrumentation.record('fetch', 'rate_wait_seconds', bucket.acquire())
+                delay = None
+
+                try:
+                    started = time.perf_counter()
+                    with instrumentation.timed('fetch', 'request_seconds'):
+                        response = self.session.get(url, **request_kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    if endpoint:
+                        self.egress.record(endpoint, 'error')
+                    if attempt >= config.max_retries:
+                        raise
+                    reason = str(e)
+                else:
+                    block = detect_block(response)
+                    if endpoint:
+                        self.egress.record(endpoint, 'blocked' if block else 'answered',
+                                           time.perf_counter() - started)
+                    if not block and response.status_code not in (500, 502, 503, 504):
+                        bucket.speed_up()
+                        return response
+
+                    reason = block or f"HTTP {response.status_code}"
+                    delay = parse_retry_after(response, config.max_retry_delay)
+
+                    if block:
+                        # Hold back every request for the pause, then continue at a lower rate
+                        self.record_stat('blocks')
+                        pause = delay if delay is not None else backoff_delay(
+                            attempt, config.retry_backoff, config.max_retry_delay)
+                        rate = bucket.slow_down(pause)
+                        through = f" through {endpoint.name}" if endpoint else ""
+                        log(f"Google Scholar is blocking requests{through} ({block}): pausing {pause:.0f} s "
+                            f"and slowing down to {rate:.2f} requests per second")
+                        delay = 0
+
+                    if attempt >= config.max_retries:
+                        if block:
+                            raise ScholarBlockedError(
+                                f"Google Scholar blocked the request ({block}) for url: {url}", response=response)
+                        return response
+
+                if delay is None:
+                    delay = backoff_delay(
+                        attempt, config.retry_backoff, config.max_retry_delay)
+                attempt += 1
+                self.record_stat('retries')
+                checkpoint(
+                    f"Retry {attempt} of {config.max_retries} in {delay:.0f} s ({reason}): {url}")
+                instrumentation.record('fetch', 'retry_sleep_seconds', delay)
+                time.sleep(delay)
+
+        finally:
+            instrumentation.record('fetch', 'retries', attempt)
+
+    def report(self):
+        """Returns the connection and transfer statistics of the run."""
+
+        with self.stats_lock:
+            stats = dict(self.stats)
+        stats['connections_reused'] = max(
+            0, stats['requests'] - stats['connections_opened'])
+        return stats
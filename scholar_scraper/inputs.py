@@ -0,0 +1,88 @@
+import os
+
+from .diagnostics import checkpoint, manual_inspection_required, INPUT_INVALID
+
+
+def is_file_empty(file_path):
+    return os.path.getsize(file_path) == 0
+
+
+def parse_years(text):
+    """
+    Parses the year periods to scrape.
+
+    Accepts a single year ("2023"), a range ("2019-2023") or a list of years and ranges
+    separated by commas, spaces or new lines ("2019, 2021-2023").
+
+    Args:
+        text (str): The years as written in the year file or on the command line.
+
+    Returns:
+        list: The years, oldest first.
+
+    Raises:
+        ValueError: If the text is empty or holds something other than years.
+    """
+    years = set()
+    for part in text.replace(',', ' ').split():
+        first, _, last = part.partition('-')
+        first = int(first)
+        last = int(last) if last else first
+        if last < first:
+            raise ValueError(f"Year range {part} ends before it starts")
+        years.update(range(first, last + 1))
+
+    if not years:
+        raise ValueError("No year given")
+
+    return sorted(years)
+
+
+def determine_years(input_year_file):
+    """Function to determine the years to extract from the Google Scholar profiles"""
+
+    try:
+        with open(input_year_file, 'r') as file:
+
+            try:
+                years = parse_years(file.read())
+            except ValueError:
+                manual_inspection_required(
+                    "Invalid year data", "input year file", input_year_file, INPUT_INVALID)
+                return None
+
+            checkpoint(f"Checkpoint 1: Year data found:\t\t\t\t\t\t\t\t\t\tGood")
+
+            return years
+
+    except FileNotFoundError:
+        manual_inspection_required(
+            "Year data not found", "input year file", input_year_file, INPUT_INVALID)
+        return None
+
+
+def check_input_file(input_file):
+
+    try:
+        with open(input_file, 'r') as file:
+            if is_file_empty(input_file):
+                manual_inspection_required(
+                    "File is empty", "input file", input_file, INPUT_INVALID)
+                exit("Program will now exit")
+
+            checkpoint(f"Checkpoint 0: File is not empty:\t\t\t\t\t\t\t\t\t\tGood")
+
+            return True
+
+    except FileNotFoundError:
+        manual_inspection_required(
+            "A file was not found", "input file", input_file, INPUT_INVALID)
+        exit("Program will now exit")
+
+
+def read_urls(input_urls_file):
+    """Yields the profile URLs of the input file, one per line, reading the file as it goes."""
+
+    with open(input_urls_file, 'r') as file:
+        for line in file:
+            yield line.rstrip('\n')
@@ -0,0 +1,177 @@
+"""
+Timing and size measurements of the scraping stages, and the profiler hook.
+
+Every stage (fetch, parse, extract, classify, write) records its measures in
+histograms with logarithmic buckets, so the memory used stays the same however long
+the run is. The report is a JSON document with, per stage and measure, the count,
+total, mean, extremes, estimated percentiles and buckets.
+"""
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Histogram:
+    """
+    Counts of values in buckets whose bounds are powers of two.
+
+    Percentiles are estimated as the upper bound of the bucket they fall in, so they
+    are at most twice the true value.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+        self.buckets = {}  # Exponent of the bucket's upper bound (None for zero) -> count
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        exponent = math.frexp(value)[1] if value > 0 else None
+        self.buckets[exponent] = self.buckets.get(exponent, 0) + 1
+
+    def percentile(self, fraction):
+        rank = fraction * self.count
+        seen = 0
+        for exponent in sorted(self.buckets, key=lambda exponent: -math.inf if exponent is None else exponent):
+            seen += self.buckets[exponent]
+            if seen >= rank:
+                return 0 if exponent is None else min(2.0 ** exponent, self.maximum)
+        return self.maximum
+
+    def summary(self):
+        if not self.count:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count,
+            'min': self.minimum,
+            'max': self.maximum,
+            'p50': self.percentile(0.5),
+            'p90': self.percentile(0.9),
+            'p99': self.percentile(0.99),
+            'buckets': {('0' if exponent is None else f'<={2.0 ** exponent:g}'): count
+                        for exponent, count in sorted(
+                            self.buckets.items(),
+                            key=lambda item: -math.inf if item[0] is None else item[0])}
+        }
+
+
+class Instrumentation:
+    """
+    The histograms of one scraper, by stage and measure. Safe to use from several threads.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}  # (stage, measure) -> Histogram
+            self.started = time.time()
+
+    def record(self, stage, measure, value):
+        with self.lock:
+            histogram = self.histograms.get((stage, measure))
+            if histogram is None:
+                histogram = self.histograms[(stage, measure)] = Histogram()
+            histogram.add(value)
+
+    @contextmanager
+    def timed(self, stage, measure='seconds'):
+        """Records the time spent in the with block."""
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, measure, time.perf_counter() - start)
+
+    def report(self, **extra):
+        """Returns the report: the summary of every histogram by stage, plus the extra values."""
+
+        with self.lock:
+            stages = {}
+            for (stage, measure), histogram in sorted(self.histograms.items()):
+                stages.setdefault(stage, {})[measure] = histogram.summary()
+            report = {'started': self.started, 'elapsed_seconds': time.time() - self.started}
+        report.update(extra)
+        report['stages'] = stages
+        return report
+
+    def write(self, path, **extra):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.report(**extra), file, indent=2)
+
+
+class Profiler:
+    """
+    Runs cProfile or pyinstrument over a run and saves what it found.
+
+    cProfile follows every thread started while it runs (the article fetches run in worker
+    threads) and saves its statistics for pstats or snakeviz. pyinstrument, which must be
+    installed, saves an HTML report of the main thread.
+
+    Args:
+        path (str): The file to save the profile to.
+        kind (str): 'cprofile' or 'pyinstrument'.
+    """
+
+    def __init__(self, path, kind='cprofile'):
+        self.path = path
+        self.kind = kind
+        self.thread_profilers = []
+        self.lock = threading.Lock()
+
+        if kind == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler as PyinstrumentProfiler
+            except ImportError:
+                raise ImportError(
+                    "The pyinstrument profiler needs pyinstrument (pip install pyinstrument)") from None
+            self.profiler = PyinstrumentProfiler()
+        else:
+            import cProfile
+            self.profiler = cProfile.Profile()
+
+    def start_thread_profiler(self, *args):
+        # Called on the first profiling event of a new thread: profile it with its own cProfile
+        import cProfile
+        import sys
+
+        sys.setprofile(None)
+        profiler = cProfile.Profile()
+        with self.lock:
+            self.thread_profilers.append(profiler)
+        profiler.enable()
+
+    def start(self):
+        if self.kind == 'cprofile':
+            threading.setprofile(self.start_thread_profiler)
+            self.profiler.enable()
+        else:
+            self.profiler.start()
+
+    def stop(self):
+        if self.kind == 'cprofile':
+            import pstats
+
+            self.profiler.disable()
+            threading.setprofile(None)
+            stats = pstats.Stats(self.profiler)
+            with self.lock:
+                for profiler in self.thread_profilers:
+                    stats.add(profiler)
+            stats.dump_stats(self.path)
+        else:
+            self.profiler.stop()
+            with open(self.path, 'w', encoding='utf-8') as file:
+                file.write(self.profiler.output_html())
@@ -0,0 +1,266 @@
+import sys
+from urllib.parse import urlparse, parse_qs
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from .diagnostics import checkpoint, manual_inspection_required, PROFILE_DATA_MISSING
+
+
+# Elements (by id) that the extract functions read from each kind of page
+profile_page_ids = ['gsc_prf_in', 'gsc_rsb_cit', 'gsc_a_b', 'gsc_bpf_more']
+article_page_ids = ['gsc_oci_table']
+auto_parser_features = None
+
+
+def get_parser_features(backend):
+    """Returns the BeautifulSoup parser to use, preferring lxml when it is installed."""
+
+    global auto_parser_features
+    if backend != 'auto':
+        return backend
+    if auto_parser_features is None:
+        try:
+            import lxml
+            auto_parser_features = 'lxml'
+        except ImportError:
+            auto_parser_features = 'html.parser'
+    return auto_parser_features
+
+
+def parse_page(text, page_ids, backend='auto', parse_only_needed_elements=True):
+    """
+    Parses a Google Scholar page, keeping only the elements the extract functions read.
+
+    Args:
+        text (str): The HTML of the page.
+        page_ids (list): The ids of the elements to keep (with everything inside them).
+        backend (str): The BeautifulSoup parser to use, or 'auto'.
+        parse_only_needed_elements (bool): Set to False to build the whole page.
+
+    Returns:
+        BeautifulSoup: The parsed document.
+    """
+    parse_only = SoupStrainer(id=page_ids) if parse_only_needed_elements else None
+    return BeautifulSoup(text, get_parser_features(backend), parse_only=parse_only)
+
+
+def extract_google_scholar_name(doc, url):
+    """
+    Extracts the full name of the Google Scholar profile from the provided HTML document.
+
+    Args:
+        doc (BeautifulSoup): The parsed HTML document.
+        url (str): The URL of the Google Scholar profile, used for error logging.
+
+    Returns:
+        str: The extracted full name if found, otherwise "Unknown".
+    """
+    name = doc.find(id="gsc_prf_in")
+    if name:
+        checkpoint(f"Checkpoint 4: Name was located:\t\t\t\t\t\t\t\t\tGood")
+        # A plain str, as a NavigableString would keep the whole page alive
+        return str(name.string) if name.string is not None else None
+    else:
+        manual_inspection_required("Name was not located", "profile URL", url, PROFILE_DATA_MISSING)
+        return "Unknown"
+
+
+def extract_h_index_values(doc, url):
+    """
+    Extracts the h-index values (overall and since) from the provided HTML document.
+
+    Args:
+        doc (BeautifulSoup): The parsed HTML document.
+        url (str): The URL of the Google Scholar profile, used for error logging.
+
+    Returns:
+        tuple: A tuple containing the h-index overall and h-index since values, or (None, None) if not found.
+    """
+    h_index = doc.find_all(string="h-index")
+    if h_index:
+        parent = h_index[0].parent.parent.parent
+        td_elements = parent.find_all('td')
+        h_index_overall = td_elements[-2].get_text(strip=True)
+        h_index_since = td_elements[-1].get_text(strip=True)
+        checkpoint(f"Checkpoint 5: H-indices found:\t\t\t\t\t\t\t\t\tGood")
+        return h_index_overall, h_index_since
+    else:
+        manual_inspection_required("H-indices not found", "profile URL", url, PROFILE_DATA_MISSING)
+        return None, None
+
+
+def extract_citation_count_of_year(doc, url, input_year):
+    """
+    Extracts the citation count for a given year from a Google Scholar document.
+    Parameters:
+    - doc: BeautifulSoup object representing the HTML document of the Google Scholar page.
+    - url: URL of the Google Scholar page.
+    - input_year: The year to extract the citation count of.
+    Returns:
+    - The citation count for the given year if it exists, otherwise None.
+    """
+
+    # Extract years and values
+    years = [span.get_text()
+             for span in doc.find_all('span', class_='gsc_g_t')]
+    values = [a.find('span', class_='gsc_g_al').get_text()
+              for a in doc.find_all('a', class_='gsc_g_a')]
+
+    # Find the value of the year
+    year_index = years.index(str(input_year)) if str(
+        input_year) in years else None
+
+    if year_index is not None and year_index < len(values):
+        checkpoint(f"Checkpoint 10: Citation count data found:\t\t\t\t\t\t\tGood")
+        return values[year_index]
+    else:
+        manual_inspection_required(
+            "Citation count data not found", "profile URL", url, PROFILE_DATA_MISSING)
+        return None
+
+
+def extract_total_citation_count(doc, url):
+    """
+    Extracts the total citation count from a Google Scholar document.
+    Parameters:
+    - doc: BeautifulSoup object representing the HTML document of the Google Scholar page.
+    - url: URL of the Google Scholar page.
+    Returns:
+    - The citation count for the given year if it exists, otherwise None.
+    """
+
+    total_value = doc.find_all(string="Citations")
+    if total_value:
+        parent = total_value[0].parent.parent.parent
+        td_elements = parent.find_all('td')
+        total_value = td_elements[-2].get_text(strip=True)
+        checkpoint(
+            f"Checkpoint 11: Total citation count data found:\t\t\t\t\t\t\t\t\tGood")
+        return total_value
+    else:
+        manual_inspection_required(
+            "Total citation count data not found", "profile URL", url, PROFILE_DATA_MISSING)
+        return total_value
+
+
+def find_articles(doc):
+    """
+    Finds the articles listed in the works table of a profile page.
+
+    Args:
+        doc (BeautifulSoup): The parsed HTML document.
+
+    Returns:
+        list: A list of article records (dicts with the 'url', 'title', 'venue' and 'year'
+              shown in the table, 'year' being None when no year is listed, and the
+              'cluster' id of the paper from its "Cited by" link, None when it is not
+              cited), in listed order.
+    """
+    articles = []
+    base_url = 'https://scholar.google.ca'
+    parent_element = doc.find(id='gsc_a_b')
+
+    if parent_element:
+        for row in parent_element.find_all(class_='gsc_a_tr'):
+            title_cell = row.find(class_='gsc_a_t')
+            link = title_cell.find('a', href=True) if title_cell else None
+            if not link or not link['href']:
+                continue
+
+            href = link['href']
+            if href.startswith('/'):
+                href = base_url + href
+
+            # The second grey line holds the venue followed by a hidden ", year"
+            venue = ''
+            grey_lines = title_cell.find_all(class_='gs_gray')
+            if len(grey_lines) > 1:
+                venue = ''.join(grey_lines[1].find_all(
+                    string=True, recursive=False)).strip()
+
+            year_cell = row.find(class_='gsc_a_y')
+            year = year_cell.get_text(strip=True) if year_cell else ''
+
+            # The "Cited by" link names the paper's cluster, the same under every co-author
+            cited_by = row.find(class_='gsc_a_ac', href=True)
+            cluster = None
+            if cited_by:
+                cluster = parse_qs(urlparse(cited_by['href']).query).get('cites', [None])[0]
+
+            articles.append({
+                'url': href,
+                'title': link.get_text(strip=True),
+                'venue': venue,
+                'year': int(year) if year.isdigit() else None,
+                'cluster': cluster
+            })
+
+    return articles
+
+
+def extract_articles(doc, url):
+    """
+    Extracts the articles listed on the provided HTML document.
+
+    Args:
+        doc (BeautifulSoup): The parsed HTML document.
+        url (str): The URL of the Google Scholar profile, used for error logging.
+
+    Returns:
+        list: A list of article records (see find_articles), or an empty list if none are found.
+    """
+    articles = find_articles(doc)
+
+    # Check if article URLs were found
+    if articles:
+        checkpoint(f"Checkpoint 6: Article URL data found:\t\t\t\t\t\t\tGood")
+    else:
+        manual_inspection_required(
+            "Article URL data not found", "article URL", url, PROFILE_DATA_MISSING)
+
+    return articles
+
+
+def has_more_articles(doc, articles, page_size):
+    """
+    Checks whether the works table continues on another page.
+    """
+    more_button = doc.find(id='gsc_bpf_more')
+    if len(articles) < page_size:
+        return False
+    return more_button is None or not more_button.has_attr('disabled')
+
+
+def find_article_fields(doc):
+    """
+    Returns the fields of an article page and its publication date, as plain strings.
+
+    Nothing returned refers to the parsed page, so it can be freed as soon as it is read.
+
+    Returns:
+        tuple: The field names and values (see field_strings) and the text of the
+               publication date (None if the page has none).
+    """
+    fields = doc.find_all('div', class_='gsc_oci_field')
+    values = doc.find_all('div', class_='gsc_oci_value')
+
+    date = None
+    for field, value in zip(fields, values):
+        if field.string and 'publication date' in field.string.strip().lower():
+            date = value.string.strip() if value.string else value.get_text(strip=True)
+            break
+
+    fields, values = field_strings(fields, values)
+    return fields, values, date
+
+
+def field_strings(fields, values):
+    """
+    Returns the names and values of an article page's field elements as the classifier reads them.
+
+    The names are interned, as the same few recur on every page, and each value is the
+    markup of its element, which the keywords are matched against.
+    """
+    return ([sys.intern(str(field.string) if field.string is not None else field.get_text())
+             for field in fields],
+            [str(value) for value in values])
@@ -0,0 +1,115 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """
+    Token bucket used to spread requests to one host over time.
+
+    The rate drops when the host pushes back and climbs back to its starting value
+    as requests succeed again.
+
+    Args:
+        rate (float): Number of tokens added per second.
+        capacity (float): Maximum number of tokens that can be stored (burst size).
+        minimum_rate (float): Lowest rate the bucket slows down to.
+    """
+
+    def __init__(self, rate, capacity, minimum_rate):
+        self.base_rate = rate
+        self.rate = rate
+        self.minimum_rate = min(minimum_rate, rate)
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0  # time.monotonic() at which the latest pause ends
+        self.lock = threading.Lock()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens +
+                          (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Takes one token, sleeping until it is available. Returns the time slept."""
+
+        # Reserve the token under the lock so waiting threads are served in order
+        with self.lock:
+            self.refill()
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def wait_time(self):
+        """Returns how long a request would wait for its token now (0 if one is available)."""
+
+        with self.lock:
+            self.refill()
+            return max(0, (1 - self.tokens) / self.rate)
+
+    def slow_down(self, pause):
+        """
+        Halves the rate and holds back every request for the given number of seconds.
+
+        The requests in flight when the host pushes back are usually blocked together, so
+        the rate is only halved once per pause: a block seen while a pause is running can
+        only lengthen that pause to its own.
+        """
+        with self.lock:
+            self.refill()
+            now = time.monotonic()
+            if now >= self.paused_until:
+                self.rate = max(self.minimum_rate, self.rate / 2)
+            self.paused_until = max(self.paused_until, now + pause)
+            self.tokens = min(self.tokens, -pause * self.rate)
+            return self.rate
+
+    def speed_up(self):
+        """Moves the rate a step back towards its starting value after a successful request."""
+
+        with self.lock:
+            if self.rate < self.base_rate:
+                self.refill()
+                self.rate = min(self.base_rate, self.rate + self.base_rate / 20)
+
+
+def rate_limit_key(url):
+    """Returns the rate budget a URL belongs to (all scholar.google.* hosts share one)."""
+
+    host = urlparse(url).netloc.lower()
+    if host.startswith('scholar.google.'):
+        return 'scholar.google.*'
+    return host
+
+
+class RateLimiters:
+    """
+    The token buckets of one scraper, one per rate budget (see rate_limit_key).
+
+    Args:
+        rate (float): Requests per second allowed for each budget.
+        capacity (float): Requests that can be sent back to back.
+        minimum_rate (float): Lowest rate a bucket slows down to.
+    """
+
+    def __init__(self, rate, capacity, minimum_rate):
+        self.rate = rate
+        self.capacity = capacity
+        self.minimum_rate = minimum_rate
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def get(self, url):
+        """Returns the token bucket of the URL's host, creating it on first use."""
+
+        key = rate_limit_key(url)
+        with self.lock:
+            if key not in self.buckets:
+                self.buckets[key] = TokenBucket(
+                    self.rate, self.capacity, self.minimum_rate)
+            return self.buckets[key]
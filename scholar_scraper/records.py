@@ -0,0 +1,120 @@
+"""
+Compact records of what a scrape found.
+
+The records hold only the values extracted from the pages (ints for the counts,
+citations and h-indices, plain strings for the text), never the parsed pages themselves,
+so a page can be freed as soon as it has been read. Article records also have a JSON
+form, for the checkpoint journal and the profile state, and a fixed-size binary form,
+for the shared article cache.
+"""
+import struct
+
+from .articles import new_counters
+
+# The article type counters, in the order an article record keeps them
+counter_names = tuple(new_counters())
+
+
+class ArticleRecord:
+    """
+    What an article page held: its publication date and, if the article was classified
+    (it falls in one of the year periods scraped), its counters and return status.
+
+    Args:
+        year (int): The publication year, or None if the page has no valid date.
+        month (int): The publication month, or None if the page has no valid date.
+        counters (dict): The article type counters (see new_counters), or None if the
+                         article was not classified.
+        status (int): The return status of the classification (see process_article_fields).
+    """
+
+    __slots__ = ('year', 'month', 'counts', 'status')
+
+    # Year, month, status (-1 when not classified) and the counts, in counter_names order
+    binary_format = struct.Struct('<ihb' + 'h' * len(counter_names))
+    size = binary_format.size
+
+    def __init__(self, year, month, counters=None, status=None):
+        self.year = year
+        self.month = month
+        self.counts = None if counters is None else tuple(counters[name] for name in counter_names)
+        self.status = status
+
+    @property
+    def classified(self):
+        return self.counts is not None
+
+    def counters(self):
+        """Returns a new dict of the article type counters (see new_counters)."""
+
+        return dict(zip(counter_names, self.counts))
+
+    def __eq__(self, other):
+        if not isinstance(other, ArticleRecord):
+            return NotImplemented
+        return ((self.year, self.month, self.counts, self.status)
+                == (other.year, other.month, other.counts, other.status))
+
+    def __repr__(self):
+        return (f"ArticleRecord(year={self.year}, month={self.month}, counts={self.counts}, "
+                f"status={self.status})")
+
+    def to_json(self):
+        """Returns the record as the JSON of the checkpoint journal and the profile state."""
+
+        classification = [self.counters(), self.status] if self.classified else None
+        return {'year': self.year, 'month': self.month, 'classification': classification}
+
+    @classmethod
+    def from_json(cls, data):
+        if data['classification'] is None:
+            return cls(data['year'], data['month'])
+        counters, status = data['classification']
+        return cls(data['year'], data['month'], counters, status)
+
+    def to_bytes(self):
+        """Returns the record packed in size bytes."""
+
+        counts = self.counts if self.classified else (0,) * len(counter_names)
+        return self.binary_format.pack(self.year or 0, self.month or 0,
+                                       self.status if self.classified else -1, *counts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        year, month, status, *counts = cls.binary_format.unpack(data)
+        record = cls(year or None, month or None)
+        if status >= 0:
+            record.counts = tuple(counts)
+            record.status = status
+        return record
+
+
+class ProfileRecord:
+    """
+    What the scrape of a profile found.
+
+    Attributes:
+        name (str): The full name on the profile.
+        h_index_overall (int): The h-index (None if it was not found, like the other numbers).
+        h_index_since (int): The h-index since five years before the latest year period.
+        total_citations (int): The total citation count of the profile.
+        citations (dict): Year period -> citation count of the year.
+        counters (dict): Year period -> article type counters of the articles in the period.
+        article_rows (list): Output rows of the articles judged (see spreadsheet.article_row).
+        listed_articles (list): Article records read from the works table, newest first.
+        article_records (dict): Article URL -> ArticleRecord of every article page judged.
+    """
+
+    __slots__ = ('name', 'h_index_overall', 'h_index_since', 'total_citations', 'citations',
+                 'counters', 'article_rows', 'listed_articles', 'article_records')
+
+    def __init__(self, name, h_index_overall, h_index_since, total_citations, citations):
+        self.name = name
+        self.h_index_overall = h_index_overall
+        self.h_index_since = h_index_since
+        self.total_citations = total_citations
+        self.citations = citations
+        self.counters = {}
+        self.article_rows = []
+        self.listed_articles = []
+        self.article_records = {}
@@ -0,0 +1,72 @@
+import itertools
+import math
+import queue
+import threading
+from concurrent.futures import Future
+
+# Kinds of request, in the order they are served within a profile
+PAGE = 0  # Profile pages, works list pages and citation exports, which the articles wait for
+ARTICLE = 1  # Article pages
+
+
+class RequestScheduler:
+    """
+    Run-wide queue of the requests of every profile, served by a fixed set of threads.
+
+    Requests are served by profile, in input order, and within a profile the pages the
+    rest of the profile waits for come before its articles. A thread that has nothing left
+    to do for the profile being scraped starts on the next profiles instead (whose profile
+    pages are submitted ahead of time), so the rate budget is not left unused while a
+    profile finishes.
+
+    Args:
+        workers (int): Number of requests in flight at once.
+    """
+
+    def __init__(self, workers):
+        self.queue = queue.PriorityQueue()
+        self.sequence = itertools.count()  # Keeps the requests of the same priority in order
+        self.threads = [threading.Thread(target=self.work, daemon=True) for _ in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, profile_number, kind, function, *args, **kwargs):
+        """
+        Queues a call of function(*args, **kwargs).
+
+        Args:
+            profile_number (int): The position of the profile in the input file.
+            kind (int): PAGE or ARTICLE.
+
+        Returns:
+            Future: The result of the call; cancelling it before it starts drops the call.
+        """
+        future = Future()
+        self.queue.put(((profile_number, kind, next(self.sequence)), future, function, args, kwargs))
+        return future
+
+    def work(self):
+        while self.serve(*self.queue.get()):
+            pass
+
+    def serve(self, priority, future, function, args, kwargs):
+        # A method of its own, so a thread waiting for its next request holds no response
+        if future is None:
+            return False
+        if not future.set_running_or_notify_cancel():
+            return True
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        return True
+
+    def shutdown(self):
+        """Stops the threads once the queued requests have been served (or cancelled)."""
+
+        for _ in self.threads:
+            self.queue.put(((math.inf, 0, next(self.sequence)), None, None, (), {}))
+        for thread in self.threads:
+            thread.join()
@@ -0,0 +1,733 @@
+import time
+from collections import deque
+from concurrent.futures import Future, wait
+from itertools import islice
+
+import requests
+
+from . import diagnostics
+from .articles import (new_counters, prefilter_articles, splice_known_articles, article_key,
+                       process_date, year_period_of, judge_article, process_article_fields)
+from .checkpoint import CheckpointJournal
+from .diagnostics import (checkpoint, log, manual_inspection_required, PROFILE_URL_INVALID,
+                          PROFILE_FETCH_FAILED, ARTICLE_LIST_INCOMPLETE, ARTICLE_FETCH_FAILED)
+from .exports import (export_formats, parse_export, normalize_title, entry_page_fields,
+                      render_article_table)
+from .fetcher import Fetcher
+from .inputs import read_urls
+from .instrumentation import Instrumentation
+from .parsing import (profile_page_ids, article_page_ids, parse_page,
+                      extract_google_scholar_name, extract_h_index_values,
+                      extract_citation_count_of_year, extract_total_citation_count,
+                      extract_articles, find_articles, has_more_articles,
+                      find_article_fields)
+from .ratelimit import RateLimiters
+from .records import ArticleRecord, ProfileRecord
+from .scheduler import RequestScheduler, PAGE, ARTICLE
+from .sinks import open_sink
+from .spreadsheet import article_row, profile_row, number
+from .state import ProfileStateStore, SharedArticleRecords
+from .summary import RunningSummary
+from .urls import (profile_user_id, transform_url, works_page_url, citation_id,
+                   export_citations_url)
+
+
+class Scraper:
+    """
+    Scrapes Google Scholar profiles with the settings of a ScraperConfig.
+
+    A scraper keeps its HTTP connections, rate budget and redirected profile ids
+    between runs, so one process can run many jobs with the same scraper. The time spent
+    in each stage (fetch, parse, extract, classify, write) is recorded in its instrumentation.
+    During a run, every request goes through one RequestScheduler, which fetches the
+    profile pages of the next profiles while the current one is still being scraped.
+
+    Args:
+        config (ScraperConfig): The settings of the jobs.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        diagnostics.set_test_mode(config.test_mode)
+        self.rate_limiters = RateLimiters(config.requests_per_second, config.request_burst,
+                                          config.minimum_requests_per_second)
+        self.instrumentation = Instrumentation()
+        self.fetcher = Fetcher(config, self.rate_limiters, self.instrumentation)
+        self.canonical_user_ids = {}  # Profile user ids that Scholar redirected, mapped to their new id
+        self.checkpoint_journal = None
+        self.state = None
+        self.shared_articles = None
+        self.scheduler = None
+        self.first_pages = {}  # Profile number -> future response of the first pages requested ahead
+        self.summary = None
+        self.sinks = []
+
+    def parse_page(self, text, page_ids):
+        self.instrumentation.record('parse', 'characters', len(text))
+        with self.instrumentation.timed('parse'):
+            return parse_page(text, page_ids, self.config.html_parser_backend,
+                              self.config.parse_only_needed_elements)
+
+    def run(self, input_urls_file, outputs, resume=False):
+        """
+        Function to process a list of URLs
+
+        Args:
+            input_urls_file (str): The file listing one profile URL per line.
+            outputs (str or list): The output file(s); the extension picks the format
+                                   (see sinks.open_sink).
+            resume (bool): Continue the run recorded in the checkpoint journal.
+        """
+
+        config = self.config
+        self.fetcher.reset_stats()
+        self.instrumentation.reset()
+
+        if isinstance(outputs, str):
+            outputs = [outputs]
+
+        self.summary = RunningSummary(config.input_years)
+        self.sinks = []
+        self.scheduler = RequestScheduler(config.max_concurrent_requests)
+        upcoming = deque()  # (profile number, URL, finished rows) of the profiles read ahead
+
+        try:
+            if config.inspection_report:
+                diagnostics.start_report(config.inspection_report, resume)
+
+            # Open the outputs (each writes its header or tables)
+            for output in outputs:
+                self.sinks.append(open_sink(output, config.input_years, config.output_batch_size))
+
+            self.checkpoint_journal = CheckpointJournal(
+                config.checkpoint_file, resume, config.input_years)
+            if config.state_file:
+                self.state = ProfileStateStore(config.state_file)
+            if config.share_articles:
+                self.shared_articles = SharedArticleRecords(config.article_cache_file)
+
+            # The profiles finished before the run was interrupted, in the order of the input file
+            finished_rows = self.checkpoint_journal.profile_rows()
+
+            def profiles():
+                # The URLs are read as they are scraped, so the input file can be of any length
+                finished = next(finished_rows, None)
+                for url in read_urls(input_urls_file):
+                    if finished and finished[0] == url:
+                        yield url, finished
+                        finished = next(finished_rows, None)
+                    else:
+                        yield url, None
+
+            checkpoint("PROCESS HAS BEGUN SCRAPING")
+
+            # The first pages of the next prefetch_profiles profiles are requested ahead
+            for profile_number, (url, finished) in enumerate(profiles()):
+                if not finished:
+                    self.prefetch_profile(profile_number, url)
+                upcoming.append((profile_number, url, finished))
+                if len(upcoming) > config.prefetch_profiles:
+                    self.finish_profile(*upcoming.popleft())
+
+            while upcoming:
+                self.finish_profile(*upcoming.popleft())
+
+            # End with the totals and averages of all the profiles
+            for sink in self.sinks:
+                sink.write_summary(self.summary)
+
+        finally:
+            for first_page in self.first_pages.values():
+                first_page.cancel()
+            self.first_pages = {}
+            self.scheduler.shutdown()
+            self.scheduler = None
+            for sink in self.sinks:
+                sink.close()
+            self.sinks = []
+            if self.state:
+                self.state.close()
+                self.state = None
+            if self.shared_articles:
+                self.shared_articles.close()
+            diagnostics.end_report()
+
+        if config.summary_file:
+            self.summary.write(config.summary_file)
+
+        self.checkpoint_journal.record_end()
+        self.checkpoint_journal.close()
+        self.checkpoint_journal = None
+
+        stats = self.fetcher.report()
+        shared = self.shared_articles.reused if self.shared_articles else 0
+        self.shared_articles = None
+        if config.metrics_file:
+            self.instrumentation.write(
+                config.metrics_file, profiles=self.summary.profiles, fetcher=stats,
+                shared_articles=shared,
+                egress=self.fetcher.egress.report() if self.fetcher.egress else None,
+                max_concurrent_requests=config.max_concurrent_requests,
+                requests_per_second=config.requests_per_second)
+        self.summary = None
+
+        log(f"\nRequests sent: {stats['requests']}")
+        log(f"Connections opened: {stats['connections_opened']}, "
+            f"reused: {stats['connections_reused']}")
+        log(f"Bytes transferred: {stats['bytes_transferred']} "
+            f"({stats['bytes_decoded']} after decompression)")
+        log(f"Pages served from the cache: {stats['cache_hits']}, "
+            f"revalidated: {stats['cache_revalidated']}")
+        log(f"Retries: {stats['retries']}, blocked by Google Scholar: {stats['blocks']}")
+        log(f"Articles reused from a co-author's profile: {shared}")
+        if self.fetcher.egress:
+            for endpoint in self.fetcher.egress.report():
+                log(f"Egress endpoint {endpoint['name']}: {endpoint['requests']} requests, "
+                    f"{endpoint['blocks']} blocked, {endpoint['errors']} failed, "
+                    f"quarantined {endpoint['quarantines']} times, health {endpoint['health']}")
+
+        checkpoint("\n\nPROCESS COMPLETED SUCCESSFULLY\n\n")
+        diagnostics.flush()
+
+    def prefetch_profile(self, profile_number, url):
+        """Requests the first page of a profile ahead of its scrape, keeping its future response in first_pages."""
+
+        # The URL is checked (and any issue reported) when the profile is scraped
+        url = transform_url(url, self.config.works_page_size, self.canonical_user_ids, report=False)
+        if url:
+            self.first_pages[profile_number] = self.schedule(
+                profile_number, PAGE, self.fetcher.get, url, allow_redirects=True)
+
+    def finish_profile(self, profile_number, url, finished):
+        """Scrapes a profile, or rewrites its rows if it was finished before the run was interrupted."""
+
+        if finished:
+            _, row, article_rows = finished
+            for sink in self.sinks:
+                sink.write_profile(row)
+                sink.write_articles(article_rows)
+            self.summary.add(row)
+        else:
+            self.process_url(url, profile_number)
+
+    def schedule(self, profile_number, kind, function, *args, **kwargs):
+        """
+        Submits a request to the run's scheduler (see RequestScheduler.submit).
+
+        Outside of a run, the request is made right away.
+
+        Returns:
+            Future: The result of the request.
+        """
+        if self.scheduler:
+            return self.scheduler.submit(profile_number, kind, function, *args, **kwargs)
+
+        future = Future()
+        try:
+            future.set_result(function(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def process_url(self, url, profile_number=0):
+        """
+        Function to process and scrape data for a single URL and write it to the outputs.
+
+        Args:
+            url (str): The profile URL, as listed in the input file.
+            profile_number (int): The position of the profile in the input file, which
+                                  orders its requests in the scheduler.
+        """
+
+        instrumentation = self.instrumentation
+        diagnostics.set_profile(url)
+        try:
+            with instrumentation.timed('profile'):
+                profile_data = self.scrape_profile(url, profile_number)
+        finally:
+            diagnostics.set_profile(None)
+
+        if profile_data is not None:
+            row = profile_row(url, profile_data, self.config.input_years)
+            article_rows = profile_data.article_rows
+            instrumentation.record('profile', 'articles', len(article_rows))
+
+            with instrumentation.timed('write'):
+                for sink in self.sinks:
+                    sink.write_profile(row)
+                    sink.write_articles(article_rows)
+
+                if self.checkpoint_journal:
+                    self.checkpoint_journal.record_profile(url, row, article_rows)
+
+                if self.state:
+                    self.state.update(url, row, profile_data.listed_articles,
+                                      profile_data.article_records)
+
+                if self.summary:
+                    self.summary.add(row)
+                    if self.config.summary_file:
+                        self.summary.write(self.config.summary_file)
+
+            return profile_data
+
+    def get_final_url(self, url, first_page=None):
+        """
+        Function to fetch a URL, following any redirection, and return the final URL.
+        The response is returned as well so the page does not have to be downloaded twice.
+        Args:
+            url (str): The original URL.
+            first_page (Future): The response of the URL, if it was requested ahead.
+        Returns:
+            tuple: The final URL after all redirects and the response, or (None, None) on failure.
+        """
+        try:
+            # Send a GET request and allow redirects (unless it was sent ahead)
+            if first_page:
+                response = first_page.result()
+            else:
+                response = self.fetcher.get(url, allow_redirects=True)
+            response.raise_for_status()
+            final_url = response.url
+
+            # Check if the final URL is different from the original one
+            if final_url != url:
+                log(f"URL has been redirected: {url} -> {final_url}")
+            else:
+                log(f"No redirection detected for URL: {url}")
+
+            # Remember a moved profile so later requests go straight to its new user id
+            requested_user = profile_user_id(url)
+            final_user = profile_user_id(final_url)
+            if requested_user and final_user and final_user != requested_user:
+                self.canonical_user_ids[requested_user] = final_user
+
+            return final_url, response
+        except requests.RequestException as e:
+            log(f"Error fetching final URL: {e}")
+            return None, None
+
+    def scrape_profile(self, url, profile_number=0):
+        """Function to scrape data from a profile (see process_url for the arguments)"""
+
+        input_years = self.config.input_years
+        profile_url = url
+        first_page = self.first_pages.pop(profile_number, None)
+        url = transform_url(url, self.config.works_page_size, self.canonical_user_ids)
+
+        # Check if the URL is empty
+        if not url:
+            manual_inspection_required(
+                "URL data is empty", "profile URL", url, PROFILE_URL_INVALID, profile=profile_url)
+            return None
+        else:
+            checkpoint(f"Checkpoint 3: URL data is not empty:\t\t\t\t\t\t\tGood")
+
+        # Fetch the profile page, following any redirects to its final URL
+        final_url, result = self.get_final_url(url, first_page)
+        del first_page  # Only result holds the page now, so it can be freed below
+
+        # If final URL is None, manual inspection is required
+        if not final_url:
+            manual_inspection_required(
+                "Unable to resolve final URL", "profile URL", profile_url, PROFILE_URL_INVALID,
+                profile=profile_url)
+            return None
+
+        try:
+
+            doc = self.parse_page(result.text, profile_page_ids)
+
+            extract_started = time.perf_counter()
+
+            full_name = extract_google_scholar_name(doc, url)
+            log(f"\n*********************************************************")
+            log(f"Full name scan for {full_name} has started.")
+            log(f"*********************************************************\n")
+
+            # Initialize the profile data (the numbers are read as ints)
+            h_index_overall, h_index_since = extract_h_index_values(doc, url)
+            total_citations = extract_total_citation_count(doc, url)
+            profile_data = ProfileRecord(
+                full_name, number(h_index_overall), number(h_index_since), number(total_citations),
+                {input_year: number(extract_citation_count_of_year(doc, url, input_year))
+                 for input_year in input_years})
+            first_articles = extract_articles(doc, final_url)
+            more = has_more_articles(doc, first_articles, self.config.works_page_size)
+            self.instrumentation.record('extract', 'seconds', time.perf_counter() - extract_started)
+
+            # Everything needed has been read from the page: free it before the articles are scraped
+            del doc, result
+
+            # In a delta run, the articles known from the last scrape are not fetched again
+            known = self.state.get(profile_url) if self.state and self.config.delta else None
+            known_records = ({article_url: ArticleRecord.from_json(article_record)
+                              for article_url, article_record in known['records'].items()}
+                             if known else {})
+            articles = self.iterate_articles(first_articles, more, final_url, profile_number)
+            if known:
+                articles = splice_known_articles(articles, known['articles'])
+
+            def listed(articles):
+                for article in articles:
+                    profile_data.listed_articles.append(article)
+                    yield article
+
+            articles = prefilter_articles(listed(articles), input_years)
+            if self.config.citation_export:
+                articles = self.classify_from_export(
+                    articles, profile_url, final_url, known_records, profile_number)
+
+            # Initialize counters (one set per year period)
+            period_counters = {input_year: new_counters() for input_year in input_years}
+            open_years = list(input_years)
+
+            # Process each article (fetched concurrently, results applied in list order)
+            for article, article_record, results in self.fetch_articles(
+                    articles, profile_url, known_records, profile_data.article_records,
+                    profile_number):
+
+                article_url = article['url']
+                if self.checkpoint_journal:
+                    self.checkpoint_journal.record_article(
+                        profile_url, article_url, article_record)
+
+                # Report each issue of the article once, even if several year periods run into it
+                reported = set()
+
+                def report(issue, code):
+                    if issue not in reported:
+                        reported.add(issue)
+                        manual_inspection_required(issue, "article URL", article_url, code,
+                                                   profile=profile_url, article=article_url)
+
+                failed = False
+                for input_year in list(open_years):
+                    article_counters, return_status = results[input_year]
+                    counters = period_counters[input_year]
+                    old_counters = counters.copy()
+                    counters = {key: value + article_counters[key]
+                                for key, value in counters.items()}
+
+                    # If the valid articles of this year period have all been processed, close it
+                    if return_status == 0:
+                        open_years.remove(input_year)
+
+                    # In the case the count was supposed to go up and didn't, manual inspection is required
+                    elif return_status == 1 and counters == old_counters:
+                        report("No counts updated", return_status)
+
+                        checkpoint(f"\nNew Counts:\n {counters} \n")
+
+                    # If the date format is invalid, manual inspection is required
+                    elif return_status == 2:
+                        report("Date format invalid", return_status)
+
+                    # If there is an error fetching data from the article, manual inspection is required
+                    elif return_status == 3:
+                        report("Error fetching data from article", return_status)
+
+                    # If an unrecognized article_field is found, manual inspection is required
+                    elif return_status == 4:
+                        report(
+                            "Unrecognized article_field (type of article could not be dertermined so article was skipped)",
+                            return_status)
+
+                    # If the article had an issue/skipped then revert to the old counters
+                    elif return_status == 2 or return_status == 3 or return_status == 4 or return_status == 5:
+                        counters = old_counters
+
+                    period_counters[input_year] = counters
+
+                    # Keep the classification of the article for the year period it falls in,
+                    # and an article that failed for every year period once, without a period
+                    if return_status in (1, 4):
+                        profile_data.article_rows.append(article_row(
+                            profile_url, article, input_year, article_counters, return_status))
+                    elif return_status in (2, 3) and not failed:
+                        failed = True
+                        profile_data.article_rows.append(article_row(
+                            profile_url, article, None, article_counters, return_status))
+
+                # If the valid articles of every year period have been processed, break the loop
+                if not open_years:
+                    break
+
+            # Add the counters to the profile data
+            profile_data.counters = period_counters
+
+            checkpoint(f"\nCheckpoint 7: Returned after scraping from profile:\tGood\n")
+
+            log(f"*********************************************************")
+            log(f"Full name scan for {full_name} is complete.")
+            log(f"*********************************************************")
+
+            return profile_data
+
+        except requests.RequestException as e:
+            manual_inspection_required("Error fetching data", "article/profile", e,
+                                       PROFILE_FETCH_FAILED, profile=profile_url)
+            return None
+
+    def fetch_articles(self, articles, profile_url, known_records=None, article_records=None,
+                       profile_number=0):
+        """
+        Scrapes articles concurrently while yielding their results in list order.
+
+        Up to max_concurrent_requests articles are queued in the scheduler at once, all of
+        them sharing the rate budget of their host. Each article is scraped against its own zeroed
+        counters so the caller can apply the results in order, exactly as the serial loop did.
+        Closing the generator early (e.g. on a return status of 0) cancels the queued articles.
+        Articles already in the checkpoint journal, known from the last scrape of the
+        profile or already scraped for a co-author's profile are not fetched again.
+
+        Args:
+            articles (iterable): The article records of a profile, newest first.
+            profile_url (str): The URL of the profile, used to look up journaled articles.
+            known_records (dict): Article URL -> page record of the articles to reuse.
+            article_records (dict): Filled with the page record of every article scraped or
+                                    reused, including the articles fetched ahead of the
+                                    caller that it never asked for.
+            profile_number (int): The position of the profile in the input file.
+
+        Yields:
+            tuple: The article record and its page record and results from scrape_article.
+        """
+        max_concurrent_requests = self.config.max_concurrent_requests
+        input_years = self.config.input_years
+        journal = self.checkpoint_journal
+        shared = self.shared_articles
+        known_records = {} if known_records is None else known_records
+        article_records = {} if article_records is None else article_records
+        articles = iter(articles)
+        pending = deque()
+
+        def submit_next():
+            for article in articles:
+                key = (profile_url, article['url'])
+                journaled = journal is not None and key in journal.article_records
+                if journaled:
+                    article_record = journal.article_records[key]
+                else:
+                    article_record = known_records.get(article['url'])
+                from_shared = False
+                if not journaled and article_record is None and shared:
+                    article_record = shared.get(article_key(article))
+                    from_shared = article_record is not None
+
+                # A known article is fetched after all if it now falls in a year period it was not classified for
+                results = None
+                if journaled or article_record is not None:
+                    results = judge_article(article_record, input_years)
+
+                if results is not None:
+                    if from_shared:
+                        shared.reused += 1
+                    future = Future()
+                    future.set_result((article_record, results))
+                else:
+                    future = self.schedule(profile_number, ARTICLE, self.scrape_article,
+                                           article['url'], input_years, profile_url)
+                pending.append((article, future))
+                return
+
+        def keep(article, article_record):
+            if article_record is not None:
+                article_records[article['url']] = article_record
+                if shared:
+                    shared.add(article_key(article), article_record)
+
+        try:
+            for _ in range(max_concurrent_requests):
+                submit_next()
+
+            while pending:
+                article, future = pending.popleft()
+                article_record, results = future.result()
+                keep(article, article_record)
+                yield article, article_record, results
+                submit_next()
+
+        finally:
+            for _, future in pending:
+                future.cancel()
+            wait([future for _, future in pending])
+
+            # Keep the pages fetched ahead, so later profiles and delta runs do not fetch them again
+            for article, future in pending:
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    keep(article, future.result()[0])
+
+    def iterate_articles(self, articles, more, url, profile_number=0):
+        """
+        Yields the articles of a profile, fetching further pages of the works table as needed.
+
+        The works table is sorted by publication date, so paging stops as soon as a page ends
+        with an article older than the oldest input year. Pages are only fetched when the caller asks
+        for more articles, so stopping the iteration (e.g. on a return status of 0) stops paging too.
+        Only one page's articles are held at a time, and each page is freed once they are read.
+
+        Args:
+            articles (list): The article records of the first page of the works table.
+            more (bool): Whether the works table continues on another page.
+            url (str): The URL of the first page of the profile.
+            profile_number (int): The position of the profile in the input file.
+
+        Yields:
+            dict: The article records (see find_articles), newest first.
+        """
+        page_size = self.config.works_page_size
+        yield from articles
+        start = 0
+
+        while more:
+            last_year = articles[-1]['year']
+            if last_year is not None and last_year < self.config.input_years[0]:
+                break
+
+            start += page_size
+            page_url = works_page_url(url, start, page_size)
+
+            try:
+                result = self.schedule(profile_number, PAGE, self.fetcher.get, page_url).result()
+                result.raise_for_status()
+            except requests.RequestException as e:
+                manual_inspection_required(
+                    f"Error fetching the article list past article {start} (the articles before it have been examined, the rest you will need to examine manually)", "profile URL", e, ARTICLE_LIST_INCOMPLETE)
+                return
+
+            doc = self.parse_page(result.text, profile_page_ids)
+            checkpoint(
+                f"Checkpoint 12: Article list page {start // page_size + 1} found:\t\t\t\t\t\tGood")
+            with self.instrumentation.timed('extract'):
+                articles = find_articles(doc)
+                more = has_more_articles(doc, articles, page_size)
+            del doc, result
+            yield from articles
+
+    def scrape_article(self, article_url, input_years, profile_url=None):
+        """
+        Scrapes an article once and judges it against every year period.
+
+        The article page is fetched and classified at most once, however many year
+        periods are scraped. It is only classified if it falls in one of them.
+
+        Args:
+            article_url (str): The URL of the article.
+            input_years (list): The year periods being scraped, oldest first.
+            profile_url (str): The URL of the profile listing the article, for the inspection report.
+
+        Returns:
+            tuple: What the page held (an ArticleRecord, or None if the page could not be
+                   fetched), and for every year period, a tuple of the article's counters
+                   and its return status (see articles.judge_article).
+        """
+
+        if not article_url:
+            return None, judge_article(None, input_years)
+
+        try:
+
+            # Send a GET request to the URL
+            result = self.fetcher.get(article_url)
+            result.raise_for_status()
+            doc = self.parse_page(result.text, article_page_ids)
+            article_record = self.page_record(doc, input_years)
+            return article_record, judge_article(article_record, input_years)
+
+        except requests.RequestException as e:
+            manual_inspection_required(
+                "Error fetching data from article", "article URL", e, ARTICLE_FETCH_FAILED,
+                profile=profile_url, article=article_url)
+            return None, judge_article(None, input_years)
+
+    def page_record(self, doc, input_years):
+        """Returns what a parsed article page holds (see scrape_article)."""
+
+        # Extract the fields and the publication date
+        with self.instrumentation.timed('extract'):
+            fields, values, date = find_article_fields(doc)
+            year, month = process_date(date)
+
+        # An article falls in at most one year period, so it is classified once at most
+        if year is not None and month is not None and year_period_of(year, month) in input_years:
+            with self.instrumentation.timed('classify'):
+                counters, status = process_article_fields(fields, values, new_counters())
+            return ArticleRecord(year, month, counters, status)
+
+        return ArticleRecord(year, month)
+
+    def classify_from_export(self, articles, profile_url, url, known_records, profile_number=0):
+        """
+        Yields the articles of a profile, classifying them from the profile's citation export first.
+
+        The articles are read a works page at a time, and the export of those that would
+        otherwise be fetched is requested in one go. Each exported entry that settles its
+        article (see exports.entry_page_fields) is classified as its article page would be,
+        and its page record is added to known_records, so only the other articles are fetched.
+
+        Args:
+            articles (iterable): The article records of a profile, newest first.
+            profile_url (str): The URL of the profile, used to look up journaled articles.
+            url (str): The URL of the profile's first works page.
+            known_records (dict): Article URL -> page record of the articles to reuse; filled
+                                  with the page records read from the exports.
+            profile_number (int): The position of the profile in the input file.
+
+        Yields:
+            dict: The article records, unchanged.
+        """
+        journal = self.checkpoint_journal
+        shared = self.shared_articles
+        articles = iter(articles)
+
+        while True:
+            chunk = list(islice(articles, self.config.works_page_size))
+            if not chunk:
+                return
+
+            wanted = [article for article in chunk
+                      if citation_id(article['url'])
+                      and article['url'] not in known_records
+                      and not (journal and (profile_url, article['url']) in journal.article_records)
+                      and not (shared and shared.get(article_key(article)))]
+            if wanted:
+                self.export_records(wanted, url, known_records, profile_number)
+            yield from chunk
+
+    def export_records(self, articles, url, known_records, profile_number=0):
+        """
+        Fetches the citation export of some articles and keeps the page records it settles.
+
+        Returns:
+            int: The number of articles classified from the export (0 if it could not be fetched).
+        """
+        export_format = self.config.citation_export
+        export_url = export_citations_url(
+            url, [citation_id(article['url']) for article in articles], export_formats[export_format])
+
+        try:
+            result = self.schedule(profile_number, PAGE, self.fetcher.get, export_url).result()
+            result.raise_for_status()
+        except requests.RequestException as e:
+            log(f"Error fetching the citation export, the article pages will be fetched instead: {e}")
+            return 0
+
+        with self.instrumentation.timed('parse'):
+            entries = {}  # normalized title -> exported entries of that title
+            for entry in parse_export(result.text, export_format):
+                entries.setdefault(normalize_title(entry['fields'].get('title', '')), []).append(entry)
+
+        classified = 0
+        for article in articles:
+            matches = entries.get(normalize_title(article['title']), [])
+            pairs = entry_page_fields(matches[0]) if len(matches) == 1 else None
+            if pairs is None:
+                continue
+            doc = self.parse_page(render_article_table(pairs), article_page_ids)
+            known_records[article['url']] = self.page_record(doc, self.config.input_years)
+            classified += 1
+
+        checkpoint(
+            f"Checkpoint 15: {classified} of {len(articles)} articles classified from the citation export:\tGood")
+        return classified
@@ -0,0 +1,149 @@
+"""
+Splitting a run into shards that are scraped by separate processes or hosts.
+
+A profile always lands in the same shard: the shard is picked by a hash of the
+profile's user= id. Each shard is an ordinary run with its own rate budget, its own
+checkpoint journal, profile state and outputs (output_shard0.csv, checkpoint_shard0.jsonl, ...),
+so shards on several hosts only need to share a directory. The merge step reads the
+shard journals and writes the outputs and summary of the whole run, in input order.
+"""
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+
+from .checkpoint import CheckpointError, CheckpointJournal
+from .diagnostics import log, manual_inspection_required, INPUT_INVALID
+from .inputs import read_urls
+from .sinks import companion_path, open_sink
+from .summary import RunningSummary
+from .urls import profile_user_id
+
+
+def shard_of(url, shards):
+    """Returns the shard (0 to shards - 1) of a profile URL, the same on every host and run."""
+
+    key = profile_user_id(url) or url.strip()
+    digest = hashlib.sha256(key.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % shards
+
+
+def shard_path(path, shard):
+    """Returns the path of a shard's file, e.g. output_shard0.csv for output.csv."""
+
+    return companion_path(path, f'shard{shard}')
+
+
+def shard_config(config, shard):
+    """Returns the settings of a shard: those of the run, with the shard's own files."""
+
+    return replace(
+        config,
+        checkpoint_file=shard_path(config.checkpoint_file, shard),
+        summary_file=shard_path(config.summary_file, shard) if config.summary_file else None,
+        state_file=shard_path(config.state_file, shard) if config.state_file else None,
+        article_cache_file=shard_path(config.article_cache_file, shard) if config.article_cache_file else None,
+        inspection_report=shard_path(config.inspection_report, shard) if config.inspection_report else None,
+        metrics_file=shard_path(config.metrics_file, shard) if config.metrics_file else None)
+
+
+def run_shard(config, input_urls_file, outputs, shard, shards, resume=False):
+    """
+    Scrapes the profiles of one shard into the shard's outputs.
+
+    Args:
+        config (ScraperConfig): The settings of the whole run.
+        input_urls_file (str): The file listing every profile URL of the run.
+        outputs (list): The outputs of the whole run.
+        shard (int): The shard to scrape, from 0 to shards - 1.
+        shards (int): The number of shards.
+        resume (bool): Continue the shard from its checkpoint journal.
+    """
+    # Imported here so the merge step does not load requests and BeautifulSoup
+    from .scraper import Scraper
+
+    shard_urls_file = shard_path(input_urls_file, shard)
+    profiles = 0
+    with open(shard_urls_file, 'w') as file:
+        for url in read_urls(input_urls_file):
+            if shard_of(url, shards) == shard:
+                file.write(url + '\n')
+                profiles += 1
+
+    log(f"Shard {shard} of {shards}: {profiles} profiles")
+    Scraper(shard_config(config, shard)).run(
+        shard_urls_file, [shard_path(output, shard) for output in outputs], resume)
+
+
+def run_shards(config, input_urls_file, outputs, shards, workers=None, resume=False):
+    """
+    Scrapes every shard in a pool of worker processes, then merges them.
+
+    Args:
+        config (ScraperConfig): The settings of the run, used by every shard.
+        input_urls_file (str): The file listing one profile URL per line.
+        outputs (list): The output files of the merged run.
+        shards (int): The number of shards to split the profiles into.
+        workers (int): The number of processes (defaults to one per shard).
+        resume (bool): Continue every shard from its checkpoint journal.
+    """
+    with ProcessPoolExecutor(max_workers=workers or shards) as executor:
+        futures = [executor.submit(run_shard, config, input_urls_file, outputs,
+                                   shard, shards, resume)
+                   for shard in range(shards)]
+        for future in futures:
+            future.result()
+
+    merge_shards(config, input_urls_file, outputs, shards)
+
+
+def merge_shards(config, input_urls_file, outputs, shards):
+    """
+    Writes the outputs and summary of a sharded run from the journals of its shards.
+
+    The profiles are written in the order of the input file, exactly as a single run
+    would have written them. Every shard journal lists its profiles in that order too, so
+    the journals are read side by side as the input file is, without holding them in memory.
+
+    Raises:
+        CheckpointError: If a shard has not finished.
+    """
+    shard_rows = []  # The finished profiles of every shard, in order
+    for shard in range(shards):
+        path = shard_path(config.checkpoint_file, shard)
+        journal = CheckpointJournal(path, True, config.input_years, read_only=True)
+        if not journal.finished:
+            manual_inspection_required(
+                f"Shard {shard} of {shards} has not finished (run it with --shard {shard}, adding --resume if it was interrupted)", "checkpoint file", path, INPUT_INVALID)
+            raise CheckpointError(f"Shard {shard} has not finished")
+        shard_rows.append(journal.profile_rows())
+
+    next_rows = [next(rows, None) for rows in shard_rows]  # The next finished profile of every shard
+
+    summary = RunningSummary(config.input_years)
+    sinks = []
+    try:
+        for output in outputs:
+            sinks.append(open_sink(output, config.input_years, config.output_batch_size))
+
+        for url in read_urls(input_urls_file):
+            shard = shard_of(url, shards)
+            if next_rows[shard] is None or next_rows[shard][0] != url:
+                continue  # The profile could not be scraped
+            _, row, article_rows = next_rows[shard]
+            next_rows[shard] = next(shard_rows[shard], None)
+            for sink in sinks:
+                sink.write_profile(row)
+                sink.write_articles(article_rows)
+            summary.add(row)
+
+        for sink in sinks:
+            sink.write_summary(summary)
+
+    finally:
+        for sink in sinks:
+            sink.close()
+
+    if config.summary_file:
+        summary.write(config.summary_file)
+
+    log(f"Merged {summary.profiles} profiles from {shards} shards")
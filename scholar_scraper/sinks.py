@@ -0,0 +1,266 @@
+"""
+Writers for the scraped data.
+
+Every sink receives the same typed rows: one per profile, one per article judged for
+a year period and, at the end, the summary of all profiles. Rows are buffered and
+handed to the format in batches of batch_size rows.
+"""
+import csv
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+
+from .spreadsheet import (header_row, profile_columns, profile_column_types, summary_columns,
+                          summary_column_types, article_columns, article_column_types)
+
+
+def companion_path(path, table):
+    """Returns the path of another table written next to path, e.g. output_articles.csv."""
+
+    stem, extension = os.path.splitext(path)
+    return f"{stem}_{table}{extension}"
+
+
+class OutputSink(ABC):
+    """
+    Base of the sinks: buffers the rows of each table and writes them in batches.
+
+    Subclasses implement write_batch(table, rows) for the 'profiles' and 'articles'
+    tables, write_summary(summary) and, when they hold files, close().
+
+    Args:
+        input_years (list): The year periods being scraped, oldest first.
+        batch_size (int): Number of rows of a table buffered before they are written.
+    """
+
+    def __init__(self, input_years, batch_size):
+        self.input_years = input_years
+        self.batch_size = batch_size
+        self.buffers = {'profiles': [], 'articles': []}
+
+    def write_profile(self, row):
+        self.add('profiles', [row])
+
+    def write_articles(self, rows):
+        self.add('articles', rows)
+
+    def add(self, table, rows):
+        buffer = self.buffers[table]
+        buffer.extend(rows)
+        if len(buffer) >= self.batch_size:
+            self.flush(table)
+
+    def flush(self, table=None):
+        for name in [table] if table else list(self.buffers):
+            if self.buffers[name]:
+                self.write_batch(name, self.buffers[name])
+                self.buffers[name] = []
+
+    @abstractmethod
+    def write_batch(self, table, rows):
+        """Writes rows to the 'profiles' or 'articles' table."""
+
+    @abstractmethod
+    def write_summary(self, summary):
+        """Writes the RunningSummary of all the profiles."""
+
+    def close(self):
+        self.flush()
+
+    @classmethod
+    def check_dependencies(cls):
+        """Raises ImportError if a module the format needs is not installed."""
+
+
+class CsvSink(OutputSink):
+    """
+    Writes the profiles to a spreadsheet, ending with the summary row, and the articles
+    to a second spreadsheet (output_articles.csv for output.csv).
+    """
+
+    def __init__(self, path, input_years, batch_size):
+        super().__init__(input_years, batch_size)
+        # Characters that cannot be encoded are dropped by the file rather than cell by cell
+        self.files = {
+            'profiles': open(path, 'w', newline='', encoding='utf-8', errors='ignore'),
+            'articles': open(companion_path(path, 'articles'), 'w', newline='',
+                             encoding='utf-8', errors='ignore')
+        }
+        self.writers = {table: csv.writer(file) for table, file in self.files.items()}
+        self.writers['profiles'].writerow(header_row(input_years))
+        self.writers['articles'].writerow(article_columns)
+
+    def write_batch(self, table, rows):
+        self.writers[table].writerows(rows)
+
+    def write_summary(self, summary):
+        self.flush('profiles')
+        self.writers['profiles'].writerow(
+            summary.row(len(profile_columns(self.input_years))))
+
+    def close(self):
+        super().close()
+        for file in self.files.values():
+            file.close()
+
+
+class JsonLinesSink(OutputSink):
+    """
+    Writes one JSON object per profile, keyed by column name, ending with the summary,
+    and one JSON object per article to a second file (output_articles.jsonl).
+    """
+
+    def __init__(self, path, input_years, batch_size):
+        super().__init__(input_years, batch_size)
+        self.columns = {'profiles': profile_columns(input_years), 'articles': article_columns}
+        self.files = {
+            'profiles': open(path, 'w', encoding='utf-8', errors='ignore'),
+            'articles': open(companion_path(path, 'articles'), 'w',
+                             encoding='utf-8', errors='ignore')
+        }
+
+    def write_batch(self, table, rows):
+        columns = self.columns[table]
+        self.files[table].write(''.join(
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False) + '\n' for row in rows))
+
+    def write_summary(self, summary):
+        self.flush('profiles')
+        record = {'Full Name': 'Summary of all Profiles', 'Profiles': summary.profiles}
+        record.update(zip((column for column, _, _ in summary.columns), summary.values()))
+        self.files['profiles'].write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def close(self):
+        super().close()
+        for file in self.files.values():
+            file.close()
+
+
+class SQLiteSink(OutputSink):
+    """
+    Writes the profiles, articles and summary to the tables of the same names in an
+    SQLite database. Existing tables are replaced; each batch is one transaction.
+    """
+
+    def __init__(self, path, input_years, batch_size):
+        super().__init__(input_years, batch_size)
+        self.connection = sqlite3.connect(path)
+        self.statements = {}
+        self.create_table('profiles', profile_columns(input_years),
+                          profile_column_types(input_years))
+        self.create_table('articles', article_columns, article_column_types)
+        self.create_table('summary', ['Profiles'] + [column for column, _, _ in summary_columns(input_years)],
+                          ['INTEGER'] + summary_column_types(input_years))
+
+    def create_table(self, table, columns, types):
+        definitions = ', '.join(f'"{column}" {column_type}'
+                                for column, column_type in zip(columns, types))
+        with self.connection:
+            self.connection.execute(f'DROP TABLE IF EXISTS {table}')
+            self.connection.execute(f'CREATE TABLE {table} ({definitions})')
+        self.statements[table] = (
+            f'INSERT INTO {table} VALUES ({", ".join("?" * len(columns))})')
+
+    def write_batch(self, table, rows):
+        with self.connection:
+            self.connection.executemany(self.statements[table], rows)
+
+    def write_summary(self, summary):
+        with self.connection:
+            self.connection.execute(self.statements['summary'],
+                                    [summary.profiles] + summary.values())
+
+    def close(self):
+        super().close()
+        self.connection.close()
+
+
+class ParquetSink(OutputSink):
+    """
+    Writes the profiles, articles and summary to three Parquet files (output.parquet,
+    output_articles.parquet and output_summary.parquet). Each batch is one row group.
+    Needs pyarrow.
+    """
+
+    def __init__(self, path, input_years, batch_size):
+        pyarrow = self.import_pyarrow()
+        super().__init__(input_years, batch_size)
+        self.pyarrow = pyarrow
+        self.path = path
+        self.schemas = {
+            'profiles': self.schema(profile_columns(input_years), profile_column_types(input_years)),
+            'articles': self.schema(article_columns, article_column_types),
+            'summary': self.schema(['Profiles'] + [column for column, _, _ in summary_columns(input_years)],
+                                   ['INTEGER'] + summary_column_types(input_years))
+        }
+        self.writers = {
+            'profiles': pyarrow.parquet.ParquetWriter(path, self.schemas['profiles']),
+            'articles': pyarrow.parquet.ParquetWriter(
+                companion_path(path, 'articles'), self.schemas['articles'])
+        }
+
+    @staticmethod
+    def import_pyarrow():
+        """Returns pyarrow, with pyarrow.parquet loaded."""
+
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError(
+                "Writing Parquet files needs pyarrow (pip install pyarrow)") from None
+        return pyarrow
+
+    @classmethod
+    def check_dependencies(cls):
+        cls.import_pyarrow()
+
+    def schema(self, columns, types):
+        arrow_types = {'TEXT': self.pyarrow.string(), 'INTEGER': self.pyarrow.int64(),
+                       'REAL': self.pyarrow.float64()}
+        return self.pyarrow.schema([(column, arrow_types[column_type])
+                                    for column, column_type in zip(columns, types)])
+
+    def table(self, name, rows):
+        schema = self.schemas[name]
+        columns = list(zip(*rows))
+        return self.pyarrow.Table.from_arrays(
+            [self.pyarrow.array(column, type=field.type) for column, field in zip(columns, schema)],
+            schema=schema)
+
+    def write_batch(self, table, rows):
+        self.writers[table].write_table(self.table(table, rows))
+
+    def write_summary(self, summary):
+        self.pyarrow.parquet.write_table(
+            self.table('summary', [[summary.profiles] + summary.values()]),
+            companion_path(self.path, 'summary'))
+
+    def close(self):
+        super().close()
+        for writer in self.writers.values():
+            writer.close()
+
+
+sink_types = {
+    '.csv': CsvSink,
+    '.jsonl': JsonLinesSink,
+    '.sqlite': SQLiteSink,
+    '.db': SQLiteSink,
+    '.parquet': ParquetSink
+}
+
+
+def open_sink(path, input_years, batch_size=100):
+    """
+    Opens the sink matching the extension of path (.csv, .jsonl, .sqlite, .db or .parquet).
+
+    Raises:
+        ValueError: If the extension is not one of them.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in sink_types:
+        raise ValueError(
+            f"Unknown output format {extension or path} (use {', '.join(sink_types)})")
+    return sink_types[extension](path, input_years, batch_size)
@@ -0,0 +1,147 @@
+"""Columns of the output spreadsheet."""
+
+# Article types counted for every year period, in column order
+article_types = ['Peer Reviewed Articles', 'arXiv Preprint', 'Books',
+                 'Book Chapters', 'Conference Papers', 'Patent']
+
+
+def period_columns(label, input_years):
+    """
+    Returns the column names of a value that is reported for every year period.
+
+    The label may contain {year}. When several year periods are scraped, labels without
+    it get the year appended so every column name stays unique.
+
+    Args:
+        label (str): The column name, with {year} where the year goes.
+        input_years (list): The year periods being scraped, oldest first.
+
+    Returns:
+        list: One column name per year period.
+    """
+    if '{year}' not in label and len(input_years) > 1:
+        label += ' {year}'
+    return [label.format(year=year) for year in input_years]
+
+
+def profile_columns(input_years):
+    """Returns the names of the columns filled for every profile."""
+
+    since_input_year = input_years[-1] - 4
+    return (
+        ['Full Name', 'Link', 'Google Scholar']
+        + period_columns('Citation Count of Year Period {year}', input_years)
+        + [f'H-Index Since {since_input_year}', 'H-Index Overall']
+        + [column for article_type in article_types
+           for column in period_columns(article_type + ' {year}', input_years)]
+        + ['Total Citations of the Profile']
+    )
+
+
+def summary_columns(input_years):
+    """
+    Returns the columns summarizing all the profiles.
+
+    Args:
+        input_years (list): The year periods being scraped, oldest first.
+
+    Returns:
+        list: A (column name, 'sum' or 'mean', profile column name) tuple per summary column.
+    """
+    since_input_year = input_years[-1] - 4
+
+    def per_period(operation, label, source_label):
+        return [(column, operation, source) for column, source in zip(
+            period_columns(label, input_years), period_columns(source_label, input_years))]
+
+    return (
+        per_period('sum', 'Year Period Citations of all Profiles',
+                   'Citation Count of Year Period {year}')
+        + [('Total Citations of all Profiles', 'sum', 'Total Citations of the Profile')]
+        + per_period('mean', 'Average Citations per Researcher in {year}',
+                     'Citation Count of Year Period {year}')
+        + [(f'Average H-Index Since {since_input_year} per Researcher', 'mean',
+            f'H-Index Since {since_input_year}'),
+           ('Average Overall H-Index', 'mean', 'H-Index Overall')]
+        + per_period('sum', 'Total Peer Reviewed Articles', 'Peer Reviewed Articles {year}')
+        + per_period('mean', 'Average Peer Reviewed Publications per Researcher',
+                     'Peer Reviewed Articles {year}')
+        + per_period('sum', 'Total Conference Papers', 'Conference Papers {year}')
+    )
+
+
+def header_row(input_years):
+    """Returns the header row of the spreadsheet for the given year periods."""
+
+    return (profile_columns(input_years)
+            + [column for column, _, _ in summary_columns(input_years)])
+
+
+def profile_column_types(input_years):
+    """Returns the type ('TEXT' or 'INTEGER') of each profile column."""
+
+    return ['TEXT'] * 3 + ['INTEGER'] * (len(profile_columns(input_years)) - 3)
+
+
+def summary_column_types(input_years):
+    """Returns the type ('INTEGER' for totals, 'REAL' for averages) of each summary column."""
+
+    return ['INTEGER' if operation == 'sum' else 'REAL'
+            for _, operation, _ in summary_columns(input_years)]
+
+
+# Columns of the per-article output, one row per article and year period it was judged for
+article_columns = ['Profile', 'Article', 'Title', 'Venue', 'Listed Year', 'Year Period',
+                   'Return Status'] + article_types
+article_column_types = ['TEXT'] * 4 + ['INTEGER'] * (len(article_columns) - 4)
+
+
+def number(value):
+    """Returns the value as an int, or None if it is not a whole number (e.g. data not found)."""
+
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def profile_row(url, profile, input_years):
+    """
+    Returns the output row of a scraped profile.
+
+    Args:
+        url (str): The profile URL as listed in the input file.
+        profile (ProfileRecord): The record returned by Scraper.scrape_profile.
+        input_years (list): The year periods being scraped, oldest first.
+
+    Returns:
+        list: The row (typed as profile_column_types), with one column per year period
+              for the values of each period.
+    """
+    return (
+        [str(profile.name), url, "Yes"]
+        + [profile.citations[year] for year in input_years]
+        + [profile.h_index_since, profile.h_index_overall]
+        + [profile.counters[year][article_type]
+           for article_type in article_types for year in input_years]
+        + [profile.total_citations]
+    )
+
+
+def article_row(profile_url, article, input_year, counters, return_status):
+    """
+    Returns the output row of an article judged for a year period.
+
+    Args:
+        profile_url (str): The profile URL as listed in the input file.
+        article (dict): The article record (see parsing.find_articles).
+        input_year (int): The year period, or None when the article failed for every period.
+        counters (dict): The article type counts the article added.
+        return_status (int): The return status of the article.
+
+    Returns:
+        list: The row, typed as article_column_types.
+    """
+    return ([profile_url, article['url'], article['title'], article['venue'],
+             article['year'], input_year, return_status]
+            + [counters[article_type] for article_type in article_types])
@@ -0,0 +1,264 @@
+import json
+import os
+import sqlite3
+import struct
+import tempfile
+import time
+
+from .classifier import keywords_version
+from .diagnostics import checkpoint, log
+from .records import ArticleRecord
+
+
+class OffsetIndex:
+    """
+    Key -> file offset map of a store, kept in a temporary SQLite database.
+
+    The index lives on disk (only SQLite's page cache is held in memory), so a store of
+    any number of keys needs the same memory. Keys keep the order they were first added in.
+    """
+
+    def __init__(self):
+        # An empty name opens a temporary database, deleted when it is closed
+        self.connection = sqlite3.connect('')
+        self.connection.execute('PRAGMA journal_mode = OFF')
+        self.connection.execute('PRAGMA synchronous = OFF')
+        self.connection.execute('CREATE TABLE offsets (key TEXT PRIMARY KEY, offset INTEGER)')
+
+    def __setitem__(self, key, offset):
+        self.connection.execute(
+            'INSERT INTO offsets VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET offset = excluded.offset',
+            (key, offset))
+
+    def get(self, key):
+        row = self.connection.execute('SELECT offset FROM offsets WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM offsets').fetchone()[0]
+
+    def values(self):
+        for (offset,) in self.connection.execute('SELECT offset FROM offsets ORDER BY rowid'):
+            yield offset
+
+    def close(self):
+        self.connection.close()
+
+
+class JsonLinesStore:
+    """
+    Records kept in a JSON Lines file, looked up by key without holding them in memory.
+
+    Records are appended as they are added, a later line replacing the earlier lines of
+    the same key, and only the file offset of the latest line of every key is kept, in an
+    OffsetIndex on disk. An interrupted run keeps every record added before it stopped, and the file
+    is compacted to one line per key when it is closed. A subclass can keep its entries
+    in another layout by overriding load, read, write, raw_entry and header.
+
+    Args:
+        path (str): The file (None for a temporary file, deleted when the store is closed).
+    """
+
+    key_field = 'key'  # The field of a record holding its key
+
+    def __init__(self, path=None):
+        self.path = path
+        self.offsets = OffsetIndex()  # key -> offset of its latest line
+        if path is None:
+            self.file = tempfile.TemporaryFile()
+        else:
+            # Appending writes at the end wherever the last lookup left the file position
+            self.file = open(path, 'ab+')
+            self.load()
+
+    def load(self):
+        self.file.seek(0)
+        offset = 0
+        line = b'\n'
+        for line in self.file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                pass
+            else:
+                self.offsets[record[self.key_field]] = offset
+            offset += len(line)
+
+        if not line.endswith(b'\n'):
+            # Start on a fresh line, as the last record was cut off by a failure
+            self.file.write(b'\n')
+
+    def read(self, key):
+        """Returns the latest record of a key, or None if there is none."""
+
+        offset = self.offsets.get(key)
+        if offset is None:
+            return None
+        self.file.seek(offset)
+        return json.loads(self.file.readline())
+
+    def raw_entry(self, offset):
+        """Returns the bytes of the entry at offset, as written to the file."""
+
+        self.file.seek(offset)
+        return self.file.readline()
+
+    def header(self):
+        """Returns the bytes the file starts with, before the entries."""
+
+        return b''
+
+    def write(self, record):
+        self.file.seek(0, os.SEEK_END)
+        self.offsets[record[self.key_field]] = self.file.tell()
+        self.file.write(json.dumps(record).encode('utf-8') + b'\n')
+        self.file.flush()
+
+    def close(self):
+        """Closes the store, keeping only the latest line of every key."""
+
+        if self.path is None:
+            self.file.close()
+            self.offsets.close()
+            return
+
+        temporary_path = self.path + '.tmp'
+        with open(temporary_path, 'wb') as file:
+            file.write(self.header())
+            for offset in self.offsets.values():
+                file.write(self.raw_entry(offset))
+        self.file.close()
+        self.offsets.close()
+        os.replace(temporary_path, self.path)
+
+
+class ProfileStateStore(JsonLinesStore):
+    """
+    What the last scrape of each profile found, kept between runs for delta runs.
+
+    For every profile it keeps the profile's row, the articles listed in its works table
+    (newest first, as far as the scrape read) and what each fetched article page held:
+    its publication date and classification. A delta run reads the works table only down
+    to the first article it already knows and reuses the known article pages.
+
+    Args:
+        path (str): The state file.
+    """
+
+    key_field = 'profile'
+
+    def load(self):
+        super().load()
+        checkpoint(
+            f"Checkpoint 14: State of {len(self.offsets)} profiles loaded:\t\t\t\t\tGood")
+
+    def get(self, profile_url):
+        """Returns the state record of a profile, or None if it has not been scraped before."""
+
+        return self.read(profile_url)
+
+    def update(self, profile_url, row, articles, article_records):
+        """
+        Records the latest scrape of a profile.
+
+        Args:
+            profile_url (str): The profile URL, as listed in the input file.
+            row (list): The profile's output row.
+            articles (list): The article records listed in the works table, newest first.
+            article_records (dict): The article URL -> ArticleRecord of every article judged.
+        """
+        self.write({'profile': profile_url, 'scraped': time.strftime('%Y-%m-%d'), 'row': row,
+                    'articles': articles,
+                    'records': {article_url: article_record.to_json()
+                                for article_url, article_record in article_records.items()}})
+
+
+class SharedArticleRecords(JsonLinesStore):
+    """
+    What the pages of the papers scraped so far held, shared by every profile listing them.
+
+    A paper co-authored by several of the profiles is fetched and classified for the first
+    of them, and its page record is reused for the others. Papers are matched by
+    articles.article_key. The records are kept for the run in a temporary file, or between
+    runs in the given file, in binary: the file starts with the hash of the keywords the
+    records were classified with (see classifier.keywords_version), then each entry is the
+    length of its key, the key and the ArticleRecord.size bytes of the record. A file
+    written with other keywords is discarded, so every paper is classified again.
+
+    Args:
+        path (str): The file keeping the records between runs (None to keep them for the run only).
+    """
+
+    key_length = struct.Struct('<H')
+    magic = b'SAR1'  # Format of the file, written before the keywords hash
+
+    def __init__(self, path=None):
+        super().__init__(path)
+        self.reused = 0  # Articles that were not fetched because a co-author's copy was
+
+    def header(self):
+        return self.magic + keywords_version()
+
+    def load(self):
+        header = self.header()
+        self.file.seek(0)
+        if self.file.read(len(header)) != header:
+            if self.file.tell():
+                log(f"The shared article records in {self.path} were classified with other "
+                    f"keywords: they are discarded and the papers will be classified again")
+            self.file.truncate(0)
+            self.file.write(header)
+            self.file.flush()
+
+        offset = len(header)
+        while True:
+            entry = self.read_entry()
+            if entry is None:
+                break
+            key, _ = entry
+            self.offsets[key] = offset
+            offset = self.file.tell()
+
+        # Drop the last entry if it was cut off by a failure
+        self.file.truncate(offset)
+
+    def read_entry(self):
+        """Reads the (key, record bytes) at the file position, or returns None at the end of the file."""
+
+        header = self.file.read(self.key_length.size)
+        if len(header) < self.key_length.size:
+            return None
+        (length,) = self.key_length.unpack(header)
+        key = self.file.read(length)
+        record = self.file.read(ArticleRecord.size)
+        if len(key) < length or len(record) < ArticleRecord.size:
+            return None
+        return key.decode('utf-8'), record
+
+    def read(self, key):
+        offset = self.offsets.get(key)
+        if offset is None:
+            return None
+        self.file.seek(offset)
+        return ArticleRecord.from_bytes(self.read_entry()[1])
+
+    def write(self, key, article_record):
+        encoded_key = key.encode('utf-8')
+        self.file.seek(0, os.SEEK_END)
+        self.offsets[key] = self.file.tell()
+        self.file.write(self.key_length.pack(len(encoded_key)) + encoded_key
+                        + article_record.to_bytes())
+        self.file.flush()
+
+    def raw_entry(self, offset):
+        self.file.seek(offset)
+        header = self.file.read(self.key_length.size)
+        (length,) = self.key_length.unpack(header)
+        return header + self.file.read(length + ArticleRecord.size)
+
+    def get(self, key):
+        return self.read(key) if key else None
+
+    def add(self, key, article_record):
+        if key and article_record is not None and self.get(key) != article_record:
+            self.write(key, article_record)
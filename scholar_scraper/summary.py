@@ -0,0 +1,69 @@
+import csv
+import os
+
+from .spreadsheet import profile_columns, summary_columns
+
+
+class RunningSummary:
+    """
+    Totals and averages of all the profiles, updated as each profile row is written.
+
+    Only a running count and total are kept per summary column, so the memory used does
+    not grow with the number of profiles. Values that are not numbers (e.g. a citation
+    count that could not be found) are left out of the sums and of the averages' counts.
+
+    Args:
+        input_years (list): The year periods being scraped, oldest first.
+    """
+
+    def __init__(self, input_years):
+        positions = {column: index for index, column in enumerate(profile_columns(input_years))}
+        self.columns = summary_columns(input_years)
+        self.sources = [positions[source] for _, _, source in self.columns]
+        self.counts = [0] * len(self.columns)
+        self.totals = [0] * len(self.columns)
+        self.profiles = 0
+
+    def add(self, row):
+        """Adds a profile row (as written to the spreadsheet) to the summary."""
+
+        self.profiles += 1
+        for index, source in enumerate(self.sources):
+            try:
+                value = float(row[source])
+            except (TypeError, ValueError, IndexError):
+                continue
+            self.counts[index] += 1
+            self.totals[index] += value
+
+    def values(self):
+        """Returns the summary values, in the order of the summary columns (None without any value)."""
+
+        values = []
+        for (_, operation, _), count, total in zip(self.columns, self.counts, self.totals):
+            if not count:
+                values.append(None)
+            elif operation == 'sum':
+                values.append(int(total) if total.is_integer() else total)
+            else:
+                values.append(round(total / count, 2))
+        return values
+
+    def row(self, width):
+        """Returns the summary as a spreadsheet row whose profile columns (width of them) are blank."""
+
+        return ['Summary of all Profiles'] + [''] * (width - 1) + self.values()
+
+    def write(self, path):
+        """
+        Writes the summary to its own CSV file, replacing the previous one.
+
+        The file is written next to its final name first, so an interrupted write
+        never leaves a partial summary behind.
+        """
+        temporary_path = path + '.tmp'
+        with open(temporary_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['Profiles'] + [column for column, _, _ in self.columns])
+            writer.writerow([self.profiles] + self.values())
+        os.replace(temporary_path, path)
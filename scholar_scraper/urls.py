@@ -0,0 +1,108 @@
+from urllib.parse import urlparse, parse_qs, parse_qsl, urlencode, urlunparse
+
+from .diagnostics import checkpoint, manual_inspection_required, PROFILE_URL_INVALID
+
+
+def profile_user_id(url):
+    """Returns the user= id of a Scholar URL, or an empty string if it has none."""
+
+    return parse_qs(urlparse(url).query).get('user', [''])[0]
+
+
+def transform_url(original_url, page_size=100, canonical_user_ids=None, report=True):
+    """
+    Transform the given URL to the desired format.
+
+    Args:
+        original_url (str): The profile URL as listed in the input file.
+        page_size (int): Number of works to request on the first page.
+        canonical_user_ids (dict): Redirected user ids mapped to their new id.
+        report (bool): Log the check of the URL (off when a profile is only read ahead).
+
+    Returns:
+        str: The URL of the works list sorted by publication date, or None if the URL is invalid.
+    """
+
+    if not original_url or not original_url.startswith(('https://scholar.google', 'http://scholar.google')):
+        if not report:
+            return None
+        manual_inspection_required(
+            "Invalid URL scheme", "profile URL", original_url, PROFILE_URL_INVALID,
+            profile=original_url)
+        return None
+    elif report:
+        checkpoint(
+            f"\n\n\n\n\nPROFILE:\nCheckpoint 2: Valid URL scheme:\t\t\t\t\t\t\t\t\tGood")
+
+    parsed_url = urlparse(original_url)
+    query_params = parse_qs(parsed_url.query)
+    query_params.update({'view_op': ['list_works'], 'sortby': ['pubdate']})
+    user = query_params.get('user', [''])[0]
+    new_query_params = {
+        'hl': query_params.get('hl', [''])[0],
+        'user': (canonical_user_ids or {}).get(user, user),
+        'view_op': 'list_works',
+        'sortby': 'pubdate',
+        'pagesize': page_size
+    }
+
+    new_query_string = urlencode(new_query_params, doseq=True)
+    return urlunparse((
+        parsed_url.scheme,
+        parsed_url.netloc,
+        parsed_url.path,
+        parsed_url.params,
+        new_query_string,
+        parsed_url.fragment
+    ))
+
+
+def works_page_url(url, start, page_size):
+    """
+    Returns the URL of the page of the works table that starts at the given row.
+    """
+    parsed_url = urlparse(url)
+    query_params = parse_qs(parsed_url.query)
+    query_params.update({'cstart': [str(start)], 'pagesize': [str(page_size)]})
+    return urlunparse(parsed_url._replace(query=urlencode(query_params, doseq=True)))
+
+
+def normalize_url(url):
+    """
+    Normalizes a URL so that equivalent Scholar URLs share one cache entry.
+
+    The scheme and host are lowercased, the fragment is dropped and the query
+    parameters are de-duplicated and sorted.
+    """
+    parsed_url = urlparse(url)
+    query = urlencode(sorted(set(parse_qsl(parsed_url.query, keep_blank_values=True))))
+    return urlunparse((parsed_url.scheme.lower(), parsed_url.netloc.lower(),
+                       parsed_url.path, parsed_url.params, query, ''))
+
+
+def citation_id(article_url):
+    """Returns the citation_for_view= id (USER:ID) of an article URL, or an empty string."""
+
+    return parse_qs(urlparse(article_url).query).get('citation_for_view', [''])[0]
+
+
+def export_citations_url(url, citation_ids, export_format):
+    """
+    Returns the URL of the citation export of some articles of a profile.
+
+    Args:
+        url (str): A URL of the profile (its host, user and language are kept).
+        citation_ids (list): The citation_for_view ids (USER:ID) of the articles to export.
+        export_format (int): Scholar's cit_fmt code (0 for BibTeX, 2 for RIS).
+    """
+    parsed_url = urlparse(url)
+    query_params = parse_qs(parsed_url.query)
+    new_query_params = {
+        'view_op': 'export_citations',
+        'hl': query_params.get('hl', ['en'])[0],
+        'user': query_params.get('user', [''])[0],
+        's': ','.join(citation_ids),
+        'cit_fmt': export_format
+    }
+    return urlunparse(parsed_url._replace(path='/citations', query=urlencode(new_query_params),
+                                          fragment=''))